@@ -0,0 +1,67 @@
+"""
+Compare the two ways /api/predict can serialize its response:
+
+  response_model  - FastAPI's default: validate every item through
+                    List[PredictionResponse], dump it, then json.dumps
+  orjson          - server.render_predictions(): bytes built directly from the
+                    internal result dicts
+
+Run from the backend directory (the model files must be present):
+    python benchmark_serialization.py
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+import numpy as np
+from pydantic import TypeAdapter
+
+import server
+
+HORIZONS = (24, 168, 8760)
+REPEATS = 20
+
+RESPONSE_ADAPTER = TypeAdapter(List[server.PredictionResponse])
+
+
+def build_results(hours: int) -> List[dict]:
+    """Prediction results for `hours` hours, built the way /predict builds them"""
+    start = datetime(2025, 1, 1)
+    timestamps = [start + timedelta(hours=i) for i in range(hours)]
+    _, festivals = server.calendar_window(start, hours)
+    loads = np.random.default_rng(0).uniform(500, 5000, hours)
+    return server.format_batch_predictions(timestamps, loads, festivals, 'catboost', with_reasoning=False)
+
+
+def response_model_path(results: List[dict]) -> bytes:
+    """What FastAPI does for response_model=List[PredictionResponse] (and JSONResponse)"""
+    validated = RESPONSE_ADAPTER.validate_python(results)
+    content = RESPONSE_ADAPTER.dump_python(validated, mode='json')
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def best_of(func, results: List[dict]) -> float:
+    """Fastest of REPEATS runs, in milliseconds"""
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        func(results)
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    print(f"{'hours':>6} {'response_model ms':>18} {'orjson ms':>10} {'speedup':>8}")
+    for hours in HORIZONS:
+        results = build_results(hours)
+        # Both paths must produce the same document
+        assert json.loads(response_model_path(results)) == json.loads(server.render_predictions(results))
+        slow = best_of(response_model_path, results)
+        fast = best_of(server.render_predictions, results)
+        print(f"{hours:>6} {slow:>18.2f} {fast:>10.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,10 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from starlette.responses import Response
+from starlette.responses import Response, StreamingResponse
 
 # Prometheus metrics
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
 import os
 import logging
 import warnings
@@ -12,11 +12,25 @@ from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Dict, Any
 import uuid
+import time
+import asyncio
+import threading
+import multiprocessing
+import concurrent.futures
+import json
+import math
+import bisect
+import hashlib
+import queue
+import gzip
+import sqlite3
+import struct
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
 import joblib
-import pandas as pd
 import numpy as np
-import requests
+import httpx
+import orjson
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 
@@ -74,6 +88,9 @@ HTTP_REQUESTS_TOTAL = Counter(
 HTTP_REQUEST_LATENCY_SECONDS = Histogram(
     'http_request_latency_seconds', 'HTTP request latency in seconds', ['endpoint']
 )
+CALENDAR_TABLE_BYTES = Gauge(
+    'calendar_table_bytes', 'Memory held by the precomputed calendar feature table', ['year']
+)
 
 
 @app.middleware("http")
@@ -113,11 +130,26 @@ logger = logging.getLogger(__name__)
 # HELPER FUNCTIONS & CACHING
 # ============================================================================
 
-# Simple in-memory cache for predictions (TTL: 30 minutes for better performance)
-PREDICTION_CACHE = {}
-CACHE_TTL = 1800  # 30 minutes - longer cache for better performance
-LAST_CACHE_CLEANUP = 0  # Track last cleanup time
-CACHE_CLEANUP_INTERVAL = 300  # Clean cache every 5 minutes (not on every request)
+# Bounded in-memory LRU cache for predictions
+# Keys are (model, cache version, hour-epoch); values are (result, cached_time).
+# Ordered least- to most-recently used, so eviction and expiry never scan the cache.
+# The cache version changes with the model artifact, the feature columns and the
+# festival calendar, so results are deterministic per key and need no TTL
+# (PREDICTION_CACHE_TTL > 0 re-enables one). The shared tier keeps its own finite
+# TTL so keys of old versions expire there.
+PREDICTION_CACHE = OrderedDict()
+CACHE_TTL = int(os.environ.get('PREDICTION_CACHE_TTL', '0'))
+SHARED_CACHE_TTL = int(os.environ.get('PREDICTION_SHARED_CACHE_TTL', str(7 * 86400)))
+PREDICTION_CACHE_MAX_ENTRIES = int(os.environ.get('PREDICTION_CACHE_MAX_ENTRIES', '100000'))
+_PREDICTION_CACHE_LOCK = threading.Lock()
+
+PREDICTION_CACHE_HITS = Counter('prediction_cache_hits_total', 'Prediction cache hits', ['model'])
+PREDICTION_CACHE_MISSES = Counter('prediction_cache_misses_total', 'Prediction cache misses', ['model'])
+PREDICTION_CACHE_EVICTIONS = Counter(
+    'prediction_cache_evictions_total', 'Prediction cache entries dropped', ['reason']
+)
+PREDICTION_CACHE_ENTRIES = Gauge('prediction_cache_entries', 'Entries held by the prediction cache')
+PREDICTION_CACHE_ENTRIES.set_function(lambda: len(PREDICTION_CACHE))
 
 # Cache for calendar/festival API calls (TTL: 24 hours - festivals don't change)
 FESTIVAL_CACHE = {}
@@ -151,25 +183,437 @@ def parse_iso_datetime(dt_str: str) -> datetime:
         dt_str = dt_str.replace('Z', '+00:00')
     return datetime.fromisoformat(dt_str)
 
-def get_cache_key(timestamp: datetime, model_name: str) -> str:
-    """Generate cache key for prediction"""
-    return f"{timestamp.strftime('%Y-%m-%d-%H')}-{model_name}"
+def get_cache_key(timestamp: datetime, model_name: str) -> tuple:
+    """Generate cache key for prediction: (model, cache version, wall-clock hours since the epoch)"""
+    return (model_name, prediction_cache_version(model_name, timestamp.year), int(to_hour64(timestamp).astype(np.int64)))
+
+def prediction_cache_version(model_name: str, year: int) -> str:
+    """Version of everything a cached prediction for an hour of `year` depends on:
+    the loaded model artifact and feature columns (MODEL_VERSIONS), that year's
+    festival calendar and the shared/disk value layout (PREDICTION_CODEC_VERSION)"""
+    return f"{MODEL_VERSIONS.get(model_name, 'none')}-{festival_calendar_fingerprint(year)}-{PREDICTION_CODEC_VERSION}"
+
+def hour_year(hour: int) -> int:
+    """Year of a wall-clock hour since the epoch (the last part of a cache key)"""
+    return int(np.datetime64(hour, 'h').astype('datetime64[Y]').astype(np.int64)) + 1970
+
+def artifact_digest(*paths: Path) -> str:
+    """Short content hash of model artifact files"""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def cache_get(timestamp: datetime, model_name: str):
+    """Cached prediction for this hour, or None. Expired entries are dropped on read."""
+    key = get_cache_key(timestamp, model_name)
+    with _PREDICTION_CACHE_LOCK:
+        entry = PREDICTION_CACHE.get(key)
+        if entry is not None:
+            if not CACHE_TTL or time.time() - entry[1] < CACHE_TTL:
+                PREDICTION_CACHE.move_to_end(key)
+                PREDICTION_CACHE_HITS.labels(model=model_name).inc()
+                return entry[0]
+            del PREDICTION_CACHE[key]
+            PREDICTION_CACHE_EVICTIONS.labels(reason='expired').inc()
+    PREDICTION_CACHE_MISSES.labels(model=model_name).inc()
+    return None
 
-def clear_old_cache():
-    """Clear cache entries older than TTL - optimized to run less frequently"""
-    global LAST_CACHE_CLEANUP
-    current_time = datetime.now(timezone.utc).timestamp()
+def cache_put(timestamp: datetime, model_name: str, result: Dict[str, Any], cached_time: float = None):
+    """Cache a prediction, evicting least recently used entries beyond the size budget"""
+    cache_put_key(get_cache_key(timestamp, model_name), result, cached_time)
+
+def cache_put_key(key: tuple, result: Dict[str, Any], cached_time: float = None, replace: bool = True):
+    """cache_put() by cache key. With replace=False an existing entry is kept."""
+    with _PREDICTION_CACHE_LOCK:
+        if not replace and key in PREDICTION_CACHE:
+            return
+        now = time.time()
+        PREDICTION_CACHE[key] = (result, cached_time or now)
+        PREDICTION_CACHE.move_to_end(key)
+        # Drop expired entries at the cold end, then enforce the size budget
+        while CACHE_TTL and PREDICTION_CACHE and now - next(iter(PREDICTION_CACHE.values()))[1] >= CACHE_TTL:
+            PREDICTION_CACHE.popitem(last=False)
+            PREDICTION_CACHE_EVICTIONS.labels(reason='expired').inc()
+        while len(PREDICTION_CACHE) > PREDICTION_CACHE_MAX_ENTRIES:
+            PREDICTION_CACHE.popitem(last=False)
+            PREDICTION_CACHE_EVICTIONS.labels(reason='lru').inc()
+
+def prediction_cache_stats() -> Dict[str, Any]:
+    """Prediction cache size and budget (reported in /health)"""
+    return {'entries': len(PREDICTION_CACHE), 'max_entries': PREDICTION_CACHE_MAX_ENTRIES, 'ttl_seconds': CACHE_TTL}
+
+def cache_get_many(timestamps: List[datetime], model_name: str) -> List[Any]:
+    """Cached predictions for these hours (None where missing).
     
-    # Only cleanup every 5 minutes (not on every request)
-    if current_time - LAST_CACHE_CLEANUP < CACHE_CLEANUP_INTERVAL:
-        return
+    The in-process LRU answers first; the rest come from the shared cache backend
+    in one round-trip and are promoted into the LRU.
+    """
+    results = [cache_get(ts, model_name) for ts in timestamps]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing and SHARED_CACHE['name'] != 'local':
+        values = shared_cache_get_many([prediction_shared_key(timestamps[i], model_name) for i in missing])
+        cached_time = time.time()
+        for i, value in zip(missing, values):
+            if value is not None:
+                results[i] = decode_prediction(value)
+                cache_put(timestamps[i], model_name, results[i], cached_time)
+    return results
+
+def cache_put_many(timestamps: List[datetime], model_name: str, results: List[Dict[str, Any]], cached_time: float = None):
+    """Cache predictions in the in-process LRU and, in one round-trip, the shared backend.
+    Also queued for the disk tier when enabled."""
+    cached_time = cached_time or time.time()
+    for ts, result in zip(timestamps, results):
+        cache_put(ts, model_name, result, cached_time)
+    if DISK_CACHE_PATH:
+        disk_cache_write([
+            ('prediction', prediction_id(get_cache_key(ts, model_name)), result, cached_time)
+            for ts, result in zip(timestamps, results)
+        ])
+    if SHARED_CACHE['name'] != 'local':
+        shared_cache_set_many({
+            prediction_shared_key(ts, model_name): encode_prediction(result)
+            for ts, result in zip(timestamps, results)
+        }, SHARED_CACHE_TTL)
+
+# ============================================================================
+# SHARED CACHE BACKEND
+# ============================================================================
+
+# Second cache tier shared by all replicas, so a new pod starts warm.
+# 'local' (default) keeps caching in-process only; 'redis' uses any
+# Redis-protocol server at CACHE_REDIS_URL.
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'local').lower()
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+CACHE_KEY_PREFIX = os.environ.get('CACHE_KEY_PREFIX', 'autoscaling:')
+
+SHARED_CACHE_SECONDS = Histogram(
+    'shared_cache_roundtrip_seconds', 'Shared cache round-trip time', ['backend', 'op']
+)
+SHARED_CACHE_KEYS = Counter(
+    'shared_cache_keys_total', 'Keys looked up in the shared cache', ['backend', 'result']
+)
+SHARED_CACHE_ERRORS = Counter(
+    'shared_cache_errors_total', 'Failed shared cache operations', ['backend', 'op']
+)
+
+# Compact value layouts: fixed header + length-prefixed UTF-8 strings
+# prediction: load, boost, is_festival, hour, len(id), len(timestamp), len(festival_name), len(model), len(reasoning)
+_PREDICTION_HEADER = struct.Struct('<ddBBIIIII')
+PREDICTION_CODEC_VERSION = 'c2'  # Bump when the layout changes (part of the cache version)
+# Calendarific year: "date\x1fname\x1fname\x1e..." (UTF-8)
+
+def encode_prediction(result: Dict[str, Any]) -> bytes:
+    """Pack a prediction result for the shared cache"""
+    strings = [result.get('id', '').encode(), result['timestamp'].encode(), result['festival_name'].encode(), result['model'].encode(), result.get('reasoning', '').encode()]
+    header = _PREDICTION_HEADER.pack(result['predicted_load'], result['boost'], result['is_festival'], result['hour'], *map(len, strings))
+    return header + b''.join(strings)
+
+def decode_prediction(data: bytes) -> Dict[str, Any]:
+    """Inverse of encode_prediction()"""
+    load, boost, is_festival, hour, *lengths = _PREDICTION_HEADER.unpack_from(data)
+    offset = _PREDICTION_HEADER.size
+    strings = []
+    for length in lengths:
+        strings.append(data[offset:offset + length].decode())
+        offset += length
+    prediction_id, timestamp, festival_name, model, reasoning = strings
+    return {
+        'id': prediction_id,
+        'timestamp': timestamp,
+        'hour': hour,
+        'predicted_load': load,
+        'is_festival': is_festival,
+        'festival_name': festival_name,
+        'boost': boost,
+        'model': model,
+        'reasoning': reasoning,
+        'reasoning_status': 'ready' if reasoning else 'none',
+    }
+
+def encode_holiday_year(holidays: Dict[str, List[str]]) -> bytes:
+    """Pack one year of Calendarific holidays ({date: [names]}) for the shared cache"""
+    return '\x1e'.join('\x1f'.join([date_str, *names]) for date_str, names in sorted(holidays.items())).encode()
+
+def decode_holiday_year(data: bytes) -> Dict[str, List[str]]:
+    """Inverse of encode_holiday_year()"""
+    holidays = {}
+    for record in filter(None, data.decode().split('\x1e')):
+        date_str, *names = record.split('\x1f')
+        holidays[date_str] = names
+    return holidays
+
+def prediction_shared_key(timestamp: datetime, model_name: str) -> bytes:
+    """Shared cache key for a prediction (same hour-epoch key as the in-process cache)"""
+    return f"{CACHE_KEY_PREFIX}pred:{prediction_id(get_cache_key(timestamp, model_name))}".encode()
+
+def prediction_id(key: tuple) -> str:
+    """Public id of a cached prediction ('model:version:hour'), see /predict/reasoning"""
+    return '%s:%s:%d' % key
+
+def parse_prediction_id(value: str) -> tuple:
+    """Cache key of a prediction id (raises ValueError if malformed)"""
+    model_name, version, hour = value.split(':')
+    return (model_name, version, int(hour))
+
+def calendarific_shared_key(country: str, year: int) -> bytes:
+    """Shared cache key for one year of Calendarific holidays"""
+    return f"{CACHE_KEY_PREFIX}calendarific:{country}:{year}".encode()
+
+def build_local_cache_backend() -> Dict[str, Any]:
+    """No shared tier: the in-process caches are the whole cache"""
+    return {
+        'name': 'local',
+        'get_many': lambda keys: [None] * len(keys),
+        'set_many': lambda items, ttl: None,
+    }
+
+def build_redis_cache_backend() -> Dict[str, Any]:
+    """Redis-protocol backend: MGET for reads, one non-transactional pipeline for writes"""
+    import redis
+    redis_client = redis.Redis.from_url(CACHE_REDIS_URL, socket_timeout=1, socket_connect_timeout=1)
     
-    LAST_CACHE_CLEANUP = current_time
+    def get_many(keys: List[bytes]) -> List[Any]:
+        return redis_client.mget(keys)
     
-    # Efficient cleanup
-    keys_to_remove = [k for k, (_, cached_time) in PREDICTION_CACHE.items() if current_time - cached_time > CACHE_TTL]
-    for k in keys_to_remove:
-        del PREDICTION_CACHE[k]
+    def set_many(items: Dict[bytes, bytes], ttl: int):
+        pipe = redis_client.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(key, value, ex=ttl or None)
+        pipe.execute()
+    
+    return {'name': 'redis', 'get_many': get_many, 'set_many': set_many}
+
+CACHE_BACKEND_BUILDERS = {
+    'local': build_local_cache_backend,
+    'redis': build_redis_cache_backend,
+}
+
+def build_cache_backend(kind: str) -> Dict[str, Any]:
+    """Build the configured shared cache backend, falling back to 'local'"""
+    if kind not in CACHE_BACKEND_BUILDERS:
+        logger.warning(f"⚠️ Unknown CACHE_BACKEND '{kind}', using in-process caching only")
+        return build_local_cache_backend()
+    try:
+        backend = CACHE_BACKEND_BUILDERS[kind]()
+    except ImportError as e:
+        logger.warning(f"⚠️ Cache backend '{kind}' not available: {e}. Using in-process caching only.")
+        return build_local_cache_backend()
+    if kind != 'local':
+        logger.info(f"✅ Shared cache backend: {kind}")
+    return backend
+
+SHARED_CACHE = build_cache_backend(CACHE_BACKEND)
+
+def shared_cache_get_many(keys: List[bytes]) -> List[Any]:
+    """Values for keys from the shared cache (None where missing or on error)"""
+    backend = SHARED_CACHE['name']
+    if not keys or backend == 'local':
+        return [None] * len(keys)
+    try:
+        with SHARED_CACHE_SECONDS.labels(backend=backend, op='get').time():
+            values = SHARED_CACHE['get_many'](keys)
+    except Exception as e:
+        SHARED_CACHE_ERRORS.labels(backend=backend, op='get').inc()
+        logger.debug(f"Shared cache read failed: {e}")
+        return [None] * len(keys)
+    hits = sum(value is not None for value in values)
+    SHARED_CACHE_KEYS.labels(backend=backend, result='hit').inc(hits)
+    SHARED_CACHE_KEYS.labels(backend=backend, result='miss').inc(len(keys) - hits)
+    return values
+
+def shared_cache_set_many(items: Dict[bytes, bytes], ttl: int):
+    """Write values to the shared cache (errors are logged, never raised)"""
+    backend = SHARED_CACHE['name']
+    if not items or backend == 'local':
+        return
+    try:
+        with SHARED_CACHE_SECONDS.labels(backend=backend, op='set').time():
+            SHARED_CACHE['set_many'](items, ttl)
+    except Exception as e:
+        SHARED_CACHE_ERRORS.labels(backend=backend, op='set').inc()
+        logger.debug(f"Shared cache write failed: {e}")
+
+# ============================================================================
+# DISK CACHE TIER
+# ============================================================================
+
+# Optional SQLite (WAL) file under the prediction and Calendarific caches so a
+# restart or rollout starts warm. Writes are queued and flushed by a background
+# thread; entries are restored in the background after startup.
+DISK_CACHE_PATH = os.environ.get('CACHE_DISK_PATH', '')
+DISK_CACHE_FLUSH_INTERVAL = float(os.environ.get('CACHE_DISK_FLUSH_INTERVAL', '1'))
+DISK_CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_DISK_MAX_ENTRIES', '500000'))  # prediction rows, oldest pruned first
+DISK_CACHE_PRUNE_INTERVAL = 3600  # seconds
+DISK_CACHE_QUEUE = queue.Queue(maxsize=200000)
+DISK_CACHE_THREADS = {}
+DISK_CACHE_RESTORED = {'calendarific': 0, 'prediction': 0}
+# Restored in this order: prediction cache versions depend on the Calendarific data
+DISK_CACHE_TTLS = {'calendarific': FESTIVAL_CACHE_TTL, 'prediction': CACHE_TTL}
+DISK_CACHE_CODECS = {
+    'calendarific': (encode_holiday_year, decode_holiday_year),
+    'prediction': (encode_prediction, decode_prediction),
+}
+
+DISK_CACHE_WRITES = Counter('disk_cache_writes_total', 'Cache entries written to the disk tier', ['namespace'])
+DISK_CACHE_DROPPED = Counter('disk_cache_dropped_total', 'Cache entries not persisted because the write queue was full')
+DISK_CACHE_PRUNED = Counter('disk_cache_pruned_total', 'Rows deleted from the disk tier', ['reason'])
+
+def open_disk_cache() -> 'sqlite3.Connection':
+    """Open (and create if needed) the disk cache database in WAL mode"""
+    connection = sqlite3.connect(DISK_CACHE_PATH, timeout=5)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS cache_entries ('
+        'namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, cached_time REAL NOT NULL, '
+        'PRIMARY KEY (namespace, key)) WITHOUT ROWID'
+    )
+    return connection
+
+def disk_cache_write(entries: List[tuple]):
+    """Queue (namespace, key, result, cached_time) entries for the write-behind thread"""
+    for entry in entries:
+        try:
+            DISK_CACHE_QUEUE.put_nowait(entry)
+        except queue.Full:
+            DISK_CACHE_DROPPED.inc()
+
+def disk_cache_writer():
+    """Write-behind loop: encode and flush queued entries in batches, pruning expired rows"""
+    connection = open_disk_cache()
+    last_prune = 0.0
+    running = True
+    while running:
+        batch = []
+        try:
+            batch.append(DISK_CACHE_QUEUE.get(timeout=DISK_CACHE_FLUSH_INTERVAL))
+            while True:
+                batch.append(DISK_CACHE_QUEUE.get_nowait())
+        except queue.Empty:
+            pass
+        if None in batch:  # Shutdown sentinel: flush what we have and stop
+            running = False
+            batch = [entry for entry in batch if entry is not None]
+        try:
+            if batch:
+                connection.executemany(
+                    'INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?)',
+                    [(namespace, key, DISK_CACHE_CODECS[namespace][0](result), cached_time)
+                     for namespace, key, result, cached_time in batch]
+                )
+                connection.commit()
+                for namespace, *_ in batch:
+                    DISK_CACHE_WRITES.labels(namespace=namespace).inc()
+            now = time.time()
+            if now - last_prune > DISK_CACHE_PRUNE_INTERVAL:
+                last_prune = now
+                prune_disk_cache(connection, now)
+        except Exception as e:
+            logger.warning(f"⚠️ Disk cache write failed: {e}")
+    connection.close()
+
+def stale_prediction_keys(keys) -> List[str]:
+    """Prediction ids (disk keys) computed by another model or calendar version"""
+    stale = []
+    for key in keys:
+        try:
+            model_name, version, hour = parse_prediction_id(key)
+        except ValueError:
+            stale.append(key)
+            continue
+        if version != prediction_cache_version(model_name, hour_year(hour)):
+            stale.append(key)
+    return stale
+
+def prune_disk_cache(connection: 'sqlite3.Connection', now: float):
+    """Delete expired rows, predictions from other versions and the oldest
+    predictions beyond DISK_CACHE_MAX_ENTRIES"""
+    for namespace, ttl in DISK_CACHE_TTLS.items():
+        if ttl:
+            deleted = connection.execute('DELETE FROM cache_entries WHERE namespace = ? AND cached_time < ?', (namespace, now - ttl)).rowcount
+            DISK_CACHE_PRUNED.labels(reason='expired').inc(deleted)
+    if MODEL_VERSIONS:
+        stale = stale_prediction_keys(key for (key,) in connection.execute("SELECT key FROM cache_entries WHERE namespace = 'prediction'"))
+        connection.executemany("DELETE FROM cache_entries WHERE namespace = 'prediction' AND key = ?", [(key,) for key in stale])
+        DISK_CACHE_PRUNED.labels(reason='stale_version').inc(len(stale))
+    (rows,) = connection.execute("SELECT COUNT(*) FROM cache_entries WHERE namespace = 'prediction'").fetchone()
+    if rows > DISK_CACHE_MAX_ENTRIES:
+        connection.execute(
+            "DELETE FROM cache_entries WHERE namespace = 'prediction' AND key IN ("
+            "SELECT key FROM cache_entries WHERE namespace = 'prediction' ORDER BY cached_time LIMIT ?)",
+            (rows - DISK_CACHE_MAX_ENTRIES,)
+        )
+        DISK_CACHE_PRUNED.labels(reason='budget').inc(rows - DISK_CACHE_MAX_ENTRIES)
+    connection.commit()
+
+def restore_disk_cache():
+    """Load unexpired entries from disk into the in-memory caches (oldest first, so
+    LRU order is kept); entries computed since startup win over restored ones.
+    Only the newest PREDICTION_CACHE_MAX_ENTRIES predictions are read (the LRU
+    can't hold more). Predictions from other model or calendar versions are
+    deleted instead."""
+    try:
+        connection = open_disk_cache()
+        now = time.time()
+        stale_keys = []
+        changed_years = []
+        for namespace, ttl in DISK_CACHE_TTLS.items():
+            decode = DISK_CACHE_CODECS[namespace][1]
+            rows = connection.execute(
+                'SELECT key, value, cached_time FROM cache_entries '
+                'WHERE namespace = ? AND cached_time >= ? ORDER BY cached_time DESC LIMIT ?',
+                (namespace, now - ttl if ttl else 0, PREDICTION_CACHE_MAX_ENTRIES if namespace == 'prediction' else -1)
+            ).fetchall()
+            for key, value, cached_time in reversed(rows):
+                if namespace == 'prediction':
+                    model_name, version, hour = parse_prediction_id(key)
+                    if version != prediction_cache_version(model_name, hour_year(hour)):
+                        stale_keys.append((namespace, key))
+                        continue
+                    cache_put_key((model_name, version, hour), decode(value), cached_time, replace=False)
+                else:
+                    country, year = key.split(':')
+                    if remember_calendarific_year(country, int(year), decode(value), cached_time):
+                        changed_years.append(int(year))
+                DISK_CACHE_RESTORED[namespace] += 1
+            if changed_years:
+                festival_calendar_changed(changed_years)
+                changed_years = []
+        if stale_keys:
+            connection.executemany('DELETE FROM cache_entries WHERE namespace = ? AND key = ?', stale_keys)
+            connection.commit()
+        connection.close()
+        logger.info(f"✅ Restored cache from disk: {DISK_CACHE_RESTORED}")
+    except Exception as e:
+        logger.warning(f"⚠️ Disk cache restore failed: {e}")
+
+def start_disk_cache():
+    """Start the restore and write-behind threads (no-op unless CACHE_DISK_PATH is set)"""
+    if not DISK_CACHE_PATH or DISK_CACHE_THREADS:
+        return
+    for name, target in (('restore', restore_disk_cache), ('writer', disk_cache_writer)):
+        DISK_CACHE_THREADS[name] = threading.Thread(target=target, name=f"disk-cache-{name}", daemon=True)
+        DISK_CACHE_THREADS[name].start()
+
+def stop_disk_cache():
+    """Flush queued writes and stop the writer"""
+    writer = DISK_CACHE_THREADS.pop('writer', None)
+    if writer:
+        DISK_CACHE_QUEUE.put(None)
+        writer.join(timeout=10)
+    DISK_CACHE_THREADS.clear()
+
+def disk_cache_stats() -> Dict[str, Any]:
+    """Disk tier status (reported in /health)"""
+    return {
+        'enabled': bool(DISK_CACHE_PATH),
+        'restored_entries': dict(DISK_CACHE_RESTORED),
+        'pending_writes': DISK_CACHE_QUEUE.qsize(),
+    }
 
 # ============================================================================
 # LOAD ML MODELS
@@ -177,6 +621,7 @@ def clear_old_cache():
 
 MODELS = {}
 FEATURE_COLUMNS = None
+MODEL_VERSIONS = {}  # model -> content hash of its artifact + feature columns (see prediction_cache_version)
 
 try:
     # Model files in backend directory
@@ -315,6 +760,10 @@ try:
     
     FEATURE_COLUMNS = joblib.load(feature_cols_path)
     
+    model_artifacts = {'catboost': catboost_path, 'lightgbm': lightgbm_path, 'xgboost': xgboost_path, 'lstm': lstm_path}
+    for name in MODELS:
+        MODEL_VERSIONS[name] = artifact_digest(model_artifacts[name], feature_cols_path)
+    
     model_count = len(MODELS)
     logger.info(f"✅ Loaded {model_count} ML models successfully: {list(MODELS.keys())}")
     logger.info(f"✅ Feature columns: {len(FEATURE_COLUMNS)}")
@@ -323,56 +772,173 @@ except Exception as e:
     MODELS = None
     FEATURE_COLUMNS = None
 
+# ============================================================================
+# OUTBOUND HTTP CLIENTS
+# ============================================================================
+
+# One pooled async client per upstream (keep-alive connections, per-upstream
+# connection and concurrency limits), living on the server's event loop. Each
+# call has a total deadline that includes waiting for a free slot. Blocking code
+# running on executor threads goes through http_request_blocking().
+HTTP_UPSTREAMS = {
+    'gemini': {'max_connections': int(os.environ.get('GEMINI_MAX_CONNECTIONS', '16')), 'deadline': 5.0},
+    'calendarific': {'max_connections': 4, 'deadline': 10.0},
+}
+HTTP_CLIENTS = {}  # upstream -> {'client': httpx.AsyncClient, 'limit': asyncio.Semaphore, 'loop': loop}
+HTTP_LOOP = None  # Event loop the clients live on (set at startup)
+
+UPSTREAM_REQUEST_SECONDS = Histogram(
+    'upstream_request_seconds', 'Outbound HTTP request time by upstream and outcome', ['upstream', 'outcome']
+)
+
+def get_http_client(upstream: str) -> Dict[str, Any]:
+    """Pooled client for an upstream, created on first use on the running loop"""
+    loop = asyncio.get_running_loop()
+    pool = HTTP_CLIENTS.get(upstream)
+    if pool is None or pool['loop'] is not loop:
+        limit = HTTP_UPSTREAMS[upstream]['max_connections']
+        pool = {
+            'client': httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+                timeout=HTTP_UPSTREAMS[upstream]['deadline'],
+            ),
+            'limit': asyncio.Semaphore(limit),
+            'loop': loop,
+        }
+        HTTP_CLIENTS[upstream] = pool
+    return pool
+
+async def http_request(upstream: str, method: str, url: str, deadline: float = None, **kwargs) -> 'httpx.Response':
+    """Send a request through the upstream's pooled client within a total deadline.
+    
+    Raises on timeouts and transport errors; HTTP error statuses are returned.
+    """
+    pool = get_http_client(upstream)
+    deadline = deadline or HTTP_UPSTREAMS[upstream]['deadline']
+    
+    async def send():
+        async with pool['limit']:
+            return await pool['client'].request(method, url, timeout=deadline, **kwargs)
+    
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        response = await asyncio.wait_for(send(), deadline)
+        outcome = 'ok' if response.status_code < 400 else f"http_{response.status_code // 100}xx"
+        return response
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        outcome = 'timeout'
+        raise
+    finally:
+        UPSTREAM_REQUEST_SECONDS.labels(upstream=upstream, outcome=outcome).observe(time.perf_counter() - start)
+
+def http_request_blocking(upstream: str, method: str, url: str, deadline: float = None, **kwargs) -> 'httpx.Response':
+    """http_request() for blocking code on executor threads: runs it on the server loop.
+    
+    Without a running server loop (scripts), falls back to a one-off request.
+    """
+    loop = HTTP_LOOP
+    if loop is None or not loop.is_running():
+        return httpx.request(method, url, timeout=deadline or HTTP_UPSTREAMS[upstream]['deadline'], **kwargs)
+    try:
+        on_loop = asyncio.get_running_loop() is loop
+    except RuntimeError:  # No loop in this thread
+        on_loop = False
+    if on_loop:
+        raise RuntimeError("http_request_blocking() called on the event loop; await http_request() instead")
+    future = asyncio.run_coroutine_threadsafe(http_request(upstream, method, url, deadline, **kwargs), loop)
+    return future.result()
+
+async def start_http_clients():
+    """Remember the server loop and open a client per upstream"""
+    global HTTP_LOOP
+    HTTP_LOOP = asyncio.get_running_loop()
+    for upstream in HTTP_UPSTREAMS:
+        get_http_client(upstream)
+
+async def close_http_clients():
+    """Close the pooled connections"""
+    global HTTP_LOOP
+    HTTP_LOOP = None
+    for pool in list(HTTP_CLIENTS.values()):
+        await pool['client'].aclose()
+    HTTP_CLIENTS.clear()
+
 # ============================================================================
 # GEMINI API INTEGRATION FOR PREDICTION REASONING
 # ============================================================================
 
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
-GEMINI_API_URL = 'https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent'
+GEMINI_API_URL = os.environ.get('GEMINI_API_URL', 'https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent')
+GEMINI_RETRY_INTERVAL = 30  # After a failed call, skip Gemini for this many seconds
+GEMINI_FAILED = 0.0  # Time of the last failed call
+
+# Reasoning depends only on a normalized signature of the prediction (model, day
+# type, time period, festival, boost, load bucket), so it is cached per signature
+# and reused across hours, requests and replicas (via the shared cache).
+REASONING_CACHE = OrderedDict()  # signature -> reasoning text, least recently used first
+REASONING_CACHE_MAX_ENTRIES = int(os.environ.get('REASONING_CACHE_MAX_ENTRIES', '5000'))
+REASONING_SHARED_TTL = 7 * 86400  # Let replicas re-ask Gemini once a week
+REASONING_LOAD_BUCKET_RATIO = 1.5  # Load buckets are [100 * 1.5^k, 100 * 1.5^(k+1))
+REASONING_FLIGHTS = {}  # signature -> Future of the Gemini call in progress
+REASONING_BATCH_SIZE = max(int(os.environ.get('REASONING_BATCH_SIZE', '24')), 1)  # Signatures per Gemini call
+_REASONING_CACHE_LOCK = threading.Lock()
+
+REASONING_CACHE_LOOKUPS = Counter(
+    'reasoning_cache_lookups_total', 'Reasoning cache lookups by result', ['result']
+)
+REASONING_BATCHES = Counter(
+    'reasoning_batches_total', 'Batched Gemini reasoning calls by result (parsed, partial or failed)', ['result']
+)
+REASONING_CACHE_ENTRIES = Gauge('reasoning_cache_entries', 'Entries held by the reasoning cache')
+REASONING_CACHE_ENTRIES.set_function(lambda: len(REASONING_CACHE))
 
-def generate_prediction_reasoning(prediction_data: Dict[str, Any]) -> str:
-    """Generate AI reasoning for a prediction using Gemini API"""
-    if not GEMINI_API_KEY:
-        return ""  # Return empty if API key not configured
+def reasoning_signature(prediction_data: Dict[str, Any]) -> str:
+    """Normalized signature of everything the reasoning prompt depends on"""
+    hour = prediction_data.get('hour', 0)
+    
+    # Determine time of day
+    if 6 <= hour < 12:
+        time_period = "morning"
+    elif 12 <= hour < 18:
+        time_period = "afternoon"
+    elif 18 <= hour < 22:
+        time_period = "evening"
+    else:
+        time_period = "night"
     
+    # Determine day type
     try:
-        # Prepare context for Gemini
-        timestamp = prediction_data.get('timestamp', '')
-        hour = prediction_data.get('hour', 0)
-        predicted_load = prediction_data.get('predicted_load', 0)
-        is_festival = prediction_data.get('is_festival', 0)
-        festival_name = prediction_data.get('festival_name', 'None')
-        boost = prediction_data.get('boost', 1.0)
-        model = prediction_data.get('model', 'catboost')
-        
-        # Determine time of day
-        if 6 <= hour < 12:
-            time_period = "morning"
-        elif 12 <= hour < 18:
-            time_period = "afternoon"
-        elif 18 <= hour < 22:
-            time_period = "evening"
-        else:
-            time_period = "night"
-        
-        # Determine day of week
-        try:
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            day_name = dt.strftime('%A')
-            is_weekend = dt.weekday() >= 5
-        except:
-            day_name = "day"
-            is_weekend = False
-        
-        # Build prompt
-        prompt = f"""Analyze this traffic prediction and provide a brief, clear reasoning (2-3 sentences max):
-
-Prediction Details:
-- Time: {day_name} {time_period} (Hour {hour}:00)
-- Predicted Traffic Load: {predicted_load:.0f} requests/hour
+        dt = datetime.fromisoformat(prediction_data.get('timestamp', '').replace('Z', '+00:00'))
+        day_type = "weekend" if dt.weekday() >= 5 else "weekday"
+    except ValueError:
+        day_type = "weekday"
+    
+    load = max(float(prediction_data.get('predicted_load', 0)), 100.0)
+    load_bucket = int(math.log(load / 100.0, REASONING_LOAD_BUCKET_RATIO))
+    festival_name = prediction_data.get('festival_name', 'None') if prediction_data.get('is_festival') else 'None'
+    boost = float(prediction_data.get('boost', 1.0))
+    model = prediction_data.get('model', 'catboost')
+    return f"{model}|{day_type}|{time_period}|{festival_name}|{boost:g}|{load_bucket}"
+
+def describe_signature(signature: str) -> str:
+    """Prediction details of a reasoning signature, as prompt lines"""
+    model, day_type, time_period, festival_name, boost, load_bucket = signature.split('|')
+    load_low = 100 * REASONING_LOAD_BUCKET_RATIO ** int(load_bucket)
+    load_high = load_low * REASONING_LOAD_BUCKET_RATIO
+    is_festival = festival_name != 'None'
+    return f"""- Time: {day_type} {time_period}
+- Predicted Traffic Load: {load_low:.0f}-{load_high:.0f} requests/hour
 - Model Used: {model}
 - Festival: {"Yes" if is_festival else "No"} ({festival_name})
-- Festival Boost: {boost}x
+- Festival Boost: {boost}x"""
+
+def build_reasoning_prompt(signature: str) -> str:
+    """Gemini prompt for a reasoning signature"""
+    return f"""Analyze this traffic prediction and provide a brief, clear reasoning (2-3 sentences max):
+
+Prediction Details:
+{describe_signature(signature)}
 
 Provide reasoning explaining:
 1. Why the traffic is at this level for this time/day
@@ -380,7 +946,14 @@ Provide reasoning explaining:
 3. Expected user behavior patterns
 
 Keep it concise and technical."""
-        
+
+def request_reasoning(prompt: str) -> str | None:
+    """Ask Gemini for reasoning (None if the call failed or Gemini is backing off
+    after a failure, so callers don't retry it per prediction)"""
+    global GEMINI_FAILED
+    if time.time() - GEMINI_FAILED < GEMINI_RETRY_INTERVAL:
+        return None
+    try:
         # Call Gemini API
         headers = {
             'Content-Type': 'application/json',
@@ -394,11 +967,11 @@ Keep it concise and technical."""
             }]
         }
         
-        response = requests.post(
+        response = http_request_blocking(
+            'gemini', 'POST',
             f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
             headers=headers,
-            json=payload,
-            timeout=5
+            json=payload
         )
         
         if response.status_code == 200:
@@ -408,18 +981,271 @@ Keep it concise and technical."""
                 return reasoning.strip()
         
         logger.warning(f"Gemini API returned status {response.status_code}")
-        return ""
         
     except Exception as e:
         logger.debug(f"Gemini API error: {e}")
-        return ""  # Return empty on error - don't break predictions
+    GEMINI_FAILED = time.time()
+    return None  # Don't break predictions
+
+def remember_reasoning(signature: str, reasoning: str):
+    """Store reasoning in the LRU, evicting beyond the size budget"""
+    with _REASONING_CACHE_LOCK:
+        REASONING_CACHE[signature] = reasoning
+        REASONING_CACHE.move_to_end(signature)
+        while len(REASONING_CACHE) > REASONING_CACHE_MAX_ENTRIES:
+            REASONING_CACHE.popitem(last=False)
+
+def build_batch_reasoning_prompt(signatures: List[str]) -> str:
+    """One Gemini prompt covering several reasoning signatures"""
+    items = "\n\n".join(f"Prediction {n}:\n{describe_signature(signature)}" for n, signature in enumerate(signatures, 1))
+    return f"""Analyze each of these traffic predictions and provide a brief, clear reasoning (2-3 sentences max) for each:
+
+{items}
+
+For each prediction explain:
+1. Why the traffic is at this level for this time/day
+2. Impact of festival (if applicable)
+3. Expected user behavior patterns
+
+Keep it concise and technical. Respond with only a JSON array, one object per prediction:
+[{{"prediction": 1, "reasoning": "..."}}, ...]"""
+
+def parse_batch_reasoning(text: str, count: int) -> Dict[int, str]:
+    """Per-prediction reasoning (1-based) from a batch response; entries that
+    cannot be parsed are left out"""
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.strip('`')
+        text = text[text.find('\n') + 1:] if '\n' in text else text
+    try:
+        items = json.loads(text[text.find('['):text.rfind(']') + 1])
+    except ValueError:
+        return {}
+    parsed = {}
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        number, reasoning = item.get('prediction'), item.get('reasoning')
+        if isinstance(number, int) and 1 <= number <= count and isinstance(reasoning, str) and reasoning.strip():
+            parsed[number] = reasoning.strip()
+    return parsed
+
+def generate_batch_reasoning(predictions: List[Dict[str, Any]]) -> List[str]:
+    """Reasoning for several predictions with one Gemini call per REASONING_BATCH_SIZE
+    uncached signatures. Signatures a response does not cover are asked about once
+    each; when the call itself fails they are left empty ("")."""
+    if not GEMINI_API_KEY:
+        return [""] * len(predictions)
+    
+    signatures = [reasoning_signature(prediction) for prediction in predictions]
+    reasonings = {}
+    owned = []
+    waiting = {}
+    with _REASONING_CACHE_LOCK:
+        for signature in dict.fromkeys(signatures):
+            if signature in REASONING_CACHE:
+                REASONING_CACHE.move_to_end(signature)
+                reasonings[signature] = REASONING_CACHE[signature]
+            elif signature in REASONING_FLIGHTS:
+                waiting[signature] = REASONING_FLIGHTS[signature]
+            else:
+                REASONING_FLIGHTS[signature] = concurrent.futures.Future()
+                owned.append(signature)
+    REASONING_CACHE_LOOKUPS.labels(result='hit').inc(sum(signature in reasonings for signature in signatures))
+    REASONING_CACHE_LOOKUPS.labels(result='coalesced').inc(len(waiting))
+    
+    try:
+        # Signatures another replica already asked about
+        shared_keys = [f"{CACHE_KEY_PREFIX}reason:{signature}".encode() for signature in owned]
+        for signature, value in zip(owned, shared_cache_get_many(shared_keys)):
+            if value is not None:
+                REASONING_CACHE_LOOKUPS.labels(result='shared_hit').inc()
+                reasonings[signature] = value.decode()
+        
+        missing = [signature for signature in owned if signature not in reasonings]
+        REASONING_CACHE_LOOKUPS.labels(result='miss').inc(len(missing))
+        uncovered = []
+        for start in range(0, len(missing), REASONING_BATCH_SIZE):
+            chunk = missing[start:start + REASONING_BATCH_SIZE]
+            text = request_reasoning(build_batch_reasoning_prompt(chunk))
+            if text is None:
+                # Gemini is down: later chunks would fail too (and are skipped while it backs off)
+                REASONING_BATCHES.labels(result='failed').inc()
+                continue
+            parsed = parse_batch_reasoning(text, len(chunk))
+            REASONING_BATCHES.labels(result='parsed' if len(parsed) == len(chunk) else 'partial').inc()
+            fresh = {chunk[number - 1]: reasoning for number, reasoning in parsed.items()}
+            uncovered += [signature for signature in chunk if signature not in fresh]
+            reasonings.update(fresh)
+        
+        # One call per signature the batch response did not cover
+        for signature in uncovered:
+            reasoning = request_reasoning(build_reasoning_prompt(signature))
+            if reasoning:
+                reasonings[signature] = reasoning
+        
+        fresh = {signature: reasonings[signature] for signature in missing if reasonings.get(signature)}
+        shared_cache_set_many({f"{CACHE_KEY_PREFIX}reason:{signature}".encode(): reasoning.encode() for signature, reasoning in fresh.items()}, REASONING_SHARED_TTL)
+        for signature in owned:
+            if reasonings.get(signature):
+                remember_reasoning(signature, reasonings[signature])
+    finally:
+        with _REASONING_CACHE_LOCK:
+            for signature in owned:
+                REASONING_FLIGHTS.pop(signature).set_result(reasonings.get(signature, ""))
+    
+    for signature, flight in waiting.items():
+        reasonings[signature] = flight.result()
+    
+    return [reasonings.get(signature, "") for signature in signatures]
+
+# ============================================================================
+# REASONING PIPELINE
+# ============================================================================
+
+# Gemini reasoning is generated off the request path: predictions are returned
+# with reasoning_status 'pending' and a bounded pool of worker threads fills in
+# 'reasoning' on the cached result (and in the shared/disk tiers). Clients poll
+# GET /api/predict/reasoning?ids=... with the prediction ids.
+REASONING_WORKERS = int(os.environ.get('REASONING_WORKERS', '4'))
+REASONING_QUEUE = queue.Queue(maxsize=int(os.environ.get('REASONING_QUEUE_SIZE', '10000')))
+REASONING_PENDING = set()  # Prediction ids queued or in progress
+REASONING_THREADS = []
+_REASONING_LOCK = threading.Lock()
+
+REASONING_JOBS = Counter('reasoning_jobs_total', 'Background reasoning jobs by result', ['result'])
+REASONING_QUEUE_DEPTH = Gauge('reasoning_queue_depth', 'Predictions waiting for reasoning')
+REASONING_QUEUE_DEPTH.set_function(lambda: REASONING_QUEUE.qsize())
+
+def queue_reasoning(result: Dict[str, Any]):
+    """Mark a prediction's reasoning pending and queue it for the workers
+    (no-op without GEMINI_API_KEY or if it is already queued)"""
+    if not GEMINI_API_KEY or result.get('reasoning'):
+        return
+    prediction_key = result.get('id')
+    with _REASONING_LOCK:
+        if prediction_key in REASONING_PENDING:
+            return
+        try:
+            REASONING_QUEUE.put_nowait(result)
+        except queue.Full:
+            REASONING_JOBS.labels(result='dropped').inc()
+            result['reasoning_status'] = 'none'
+            return
+        if prediction_key:
+            REASONING_PENDING.add(prediction_key)
+        result['reasoning_status'] = 'pending'
+
+def reasoning_worker():
+    """Generate reasoning for queued predictions, a batch at a time, until stopped"""
+    running = True
+    while running:
+        batch = [REASONING_QUEUE.get()]
+        # Collect what is queued right behind it (a /predict window arrives together)
+        while batch[-1] is not None and len(batch) < REASONING_BATCH_SIZE:
+            try:
+                batch.append(REASONING_QUEUE.get(timeout=0.02))
+            except queue.Empty:
+                break
+        if batch[-1] is None:
+            running = False
+            batch.pop()
+        if not batch:
+            continue
+        
+        try:
+            reasonings = generate_batch_reasoning(batch)
+        except Exception as e:
+            logger.debug(f"Failed to generate reasoning: {e}")
+            reasonings = [""] * len(batch)
+        
+        finished = []
+        for result, reasoning in zip(batch, reasonings):
+            result['reasoning'] = reasoning
+            result['reasoning_status'] = 'ready' if reasoning else 'none'
+            REASONING_JOBS.labels(result='ready' if reasoning else 'empty').inc()
+            prediction_key = result.get('id')
+            if prediction_key:
+                with _REASONING_LOCK:
+                    REASONING_PENDING.discard(prediction_key)
+                if reasoning:
+                    finished.append((prediction_key, result))
+        
+        # Store next to the cached predictions in the other tiers
+        shared_cache_set_many({
+            f"{CACHE_KEY_PREFIX}pred:{prediction_key}".encode(): encode_prediction(result)
+            for prediction_key, result in finished
+        }, SHARED_CACHE_TTL)
+        if DISK_CACHE_PATH:
+            disk_cache_write([('prediction', prediction_key, result, time.time()) for prediction_key, result in finished])
+
+def start_reasoning_workers():
+    """Start the reasoning worker threads (only when Gemini is configured)"""
+    if not GEMINI_API_KEY or REASONING_THREADS:
+        return
+    for i in range(REASONING_WORKERS):
+        thread = threading.Thread(target=reasoning_worker, name=f"reasoning-{i}", daemon=True)
+        thread.start()
+        REASONING_THREADS.append(thread)
+
+def stop_reasoning_workers():
+    """Stop the reasoning workers (queued jobs are abandoned)"""
+    while True:
+        try:
+            REASONING_QUEUE.get_nowait()
+        except queue.Empty:
+            break
+    for _ in REASONING_THREADS:
+        REASONING_QUEUE.put(None)
+    REASONING_THREADS.clear()
+    REASONING_PENDING.clear()
+
+def lookup_reasoning(prediction_ids: List[str]) -> List[Dict[str, Any]]:
+    """Reasoning status of predictions by id, from the in-process or shared cache"""
+    keys = []
+    for value in prediction_ids:
+        try:
+            keys.append(parse_prediction_id(value))
+        except ValueError:
+            keys.append(None)
+    
+    results = [PREDICTION_CACHE.get(key, (None,))[0] if key else None for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None and keys[i]]
+    if missing:
+        values = shared_cache_get_many([f"{CACHE_KEY_PREFIX}pred:{prediction_ids[i]}".encode() for i in missing])
+        for i, value in zip(missing, values):
+            if value is not None:
+                results[i] = decode_prediction(value)
+    
+    return [
+        {
+            'id': value,
+            'status': result.get('reasoning_status', 'none') if result else 'unknown',
+            'reasoning': result.get('reasoning', '') if result else '',
+        }
+        for value, result in zip(prediction_ids, results)
+    ]
 
 # ============================================================================
 # CALENDARIFIC API INTEGRATION
 # ============================================================================
 
 CALENDARIFIC_API_KEY = os.environ.get('CALENDARIFIC_API_KEY', '')
-CALENDARIFIC_BASE_URL = 'https://calendarific.com/api/v2'
+CALENDARIFIC_BASE_URL = os.environ.get('CALENDARIFIC_BASE_URL', 'https://calendarific.com/api/v2')
+
+# Calendarific holidays are downloaded a whole year per country at a time and
+# kept in memory, so per-day lookups never wait on the API. A background task
+# refreshes the current and next year.
+CALENDARIFIC_REFRESH_INTERVAL = int(os.environ.get('CALENDARIFIC_REFRESH_INTERVAL', '86400'))  # seconds
+CALENDARIFIC_RETRY_INTERVAL = 300  # Wait after a failed download before trying that year again
+CALENDARIFIC_HOLIDAYS = {}  # (country, year) -> {date_str: [holiday names]}
+CALENDARIFIC_FETCHED = {}  # (country, year) -> time the holidays were downloaded
+CALENDARIFIC_FAILED = {}  # (country, year) -> time of the last failed download
+_CALENDARIFIC_LOCK = threading.Lock()
+
+CALENDARIFIC_YEAR_LOADS = Counter(
+    'calendarific_year_loads_total', 'Calendarific holiday years loaded', ['source']
+)
 
 # Major festivals with traffic boost multipliers (from training data)
 INDIAN_FESTIVALS = {
@@ -460,11 +1286,11 @@ INDIAN_FESTIVALS = {
     '2026-12-25': {'name': 'Christmas', 'boost': 3.2},
 }
 
-# Backward compatibility - convert to simple dict for existing functions
-HARDCODED_FESTIVALS = {k: v['name'] for k, v in INDIAN_FESTIVALS.items()}
-
 def check_festival_calendarific(date_str: str, country: str = 'IN') -> Dict[str, Any]:
-    """Check if date is a festival using Calendarific API with hardcoded fallback and caching"""
+    """Check if date is a festival using the hardcoded list and Calendarific holidays, with caching.
+    
+    Calendarific data is looked up per year; only a year that was never loaded costs an API call.
+    """
     try:
         # Validate date format
         if not date_str or len(date_str) < 10:
@@ -475,71 +1301,23 @@ def check_festival_calendarific(date_str: str, country: str = 'IN') -> Dict[str,
         cache_key = f"{date_str}_{country}"
         current_time = datetime.now(timezone.utc).timestamp()
         
-        if cache_key in FESTIVAL_CACHE:
-            cached_result, cached_time = FESTIVAL_CACHE[cache_key]
+        cached = FESTIVAL_CACHE.get(cache_key)
+        if cached is not None:
+            cached_result, cached_time = cached
             if current_time - cached_time < FESTIVAL_CACHE_TTL:
                 return cached_result
             else:
-                # Expired, remove from cache
-                del FESTIVAL_CACHE[cache_key]
+                # Expired, remove from cache (the refresh thread may have replaced it already)
+                FESTIVAL_CACHE.pop(cache_key, None)
         
         date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        year = date_obj.year
-        month = date_obj.month
-        day = date_obj.day
-        
-        # First check our Indian festivals list with boost values (fastest - no API call)
-        if date_str in INDIAN_FESTIVALS:
-            festival_data = INDIAN_FESTIVALS[date_str]
-            result = {
-                'is_festival': 1,
-                'festival_name': festival_data['name'],
-                'boost': festival_data['boost'],
-                'all_festivals': [festival_data['name']]
-            }
-            # Cache the result
-            FESTIVAL_CACHE[cache_key] = (result, current_time)
-            return result
         
-        # Try API if key is available (only for dates not in hardcoded list)
-        if CALENDARIFIC_API_KEY:
-            url = f"{CALENDARIFIC_BASE_URL}/holidays"
-            params = {
-                'api_key': CALENDARIFIC_API_KEY,
-                'country': country,
-                'year': year,
-                'month': month,
-                'day': day
-            }
-            
-            try:
-                # Reduced timeout for faster failure
-                response = requests.get(url, params=params, timeout=3)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Check if API returned valid data
-                    if data.get('meta', {}).get('code') == 200:
-                        holidays = data.get('response', {}).get('holidays', [])
-                        
-                        if holidays:
-                            festival_names = [h['name'] for h in holidays]
-                            result = {
-                                'is_festival': 1,
-                                'festival_name': festival_names[0],
-                                'boost': 1.5,  # Default boost for other festivals
-                                'all_festivals': festival_names
-                            }
-                            # Cache the result
-                            FESTIVAL_CACHE[cache_key] = (result, current_time)
-                            return result
-            except Exception as api_error:
-                logger.debug(f"Calendarific API error for {date_str}: {api_error}, using fallback")
+        # Make sure the year's Calendarific holidays are loaded (memory read once they are)
+        if date_str not in INDIAN_FESTIVALS:
+            load_calendar_years([date_obj.year], country)
         
-        # Default: not a festival
-        result = {'is_festival': 0, 'festival_name': 'None', 'boost': 1.0, 'all_festivals': []}
-        # Cache the result (even negative results to avoid repeated API calls)
+        result = calendar_festival_info(date_str, country)
+        # Cache the result (even negative results)
         FESTIVAL_CACHE[cache_key] = (result, current_time)
         return result
         
@@ -547,6 +1325,201 @@ def check_festival_calendarific(date_str: str, country: str = 'IN') -> Dict[str,
         logger.warning(f"Calendarific API error: {e}")
         return {'is_festival': 0, 'festival_name': 'None', 'boost': 1.0, 'all_festivals': []}
 
+def calendar_festival_info(date_str: str, country: str = 'IN') -> Dict[str, Any]:
+    """Festival info from INDIAN_FESTIVALS and loaded Calendarific holidays (no API calls)"""
+    festival_data = INDIAN_FESTIVALS.get(date_str)
+    if festival_data:
+        return {
+            'is_festival': 1,
+            'festival_name': festival_data['name'],
+            'boost': festival_data['boost'],
+            'all_festivals': [festival_data['name']]
+        }
+    names = CALENDARIFIC_HOLIDAYS.get((country, int(date_str[:4])), {}).get(date_str)
+    if names:
+        return {
+            'is_festival': 1,
+            'festival_name': names[0],
+            'boost': 1.5,  # Default boost for other festivals
+            'all_festivals': names
+        }
+    return {'is_festival': 0, 'festival_name': 'None', 'boost': 1.0, 'all_festivals': []}
+
+def fetch_calendarific_year(year: int, country: str = 'IN') -> Dict[str, List[str]]:
+    """Download all holidays of one year in a single API call (raises on failure)"""
+    params = {'api_key': CALENDARIFIC_API_KEY, 'country': country, 'year': year}
+    response = http_request_blocking('calendarific', 'GET', f"{CALENDARIFIC_BASE_URL}/holidays", params=params)
+    response.raise_for_status()
+    data = response.json()
+    if data.get('meta', {}).get('code') != 200:
+        raise ValueError(f"Calendarific returned {data.get('meta')}")
+    
+    holidays = {}
+    for holiday in data.get('response', {}).get('holidays', []):
+        holidays.setdefault(holiday['date']['iso'][:10], []).append(holiday['name'])
+    return holidays
+
+def remember_calendarific_year(country: str, year: int, holidays: Dict[str, List[str]], fetched_time: float) -> bool:
+    """Install one year of holidays and refresh FESTIVAL_CACHE for it in bulk.
+    Returns True if the calendar changed (callers then call festival_calendar_changed() for the year)."""
+    with _CALENDARIFIC_LOCK:
+        key = (country, year)
+        if fetched_time < CALENDARIFIC_FETCHED.get(key, 0):
+            return False
+        CALENDARIFIC_FETCHED[key] = fetched_time
+        CALENDARIFIC_FAILED.pop(key, None)
+        if CALENDARIFIC_HOLIDAYS.get(key) == holidays:
+            return False
+        CALENDARIFIC_HOLIDAYS[key] = holidays
+    
+    prefix, suffix = f"{year}-", f"_{country}"
+    # Snapshot the keys: request threads insert into FESTIVAL_CACHE concurrently
+    for cache_key in [k for k in list(FESTIVAL_CACHE) if k.startswith(prefix) and k.endswith(suffix)]:
+        FESTIVAL_CACHE.pop(cache_key, None)
+    now = time.time()
+    for date_str in holidays:
+        FESTIVAL_CACHE[f"{date_str}_{country}"] = (calendar_festival_info(date_str, country), now)
+    logger.info(f"✅ Loaded {len(holidays)} Calendarific holiday dates for {country} {year}")
+    return True
+
+def load_calendarific_year(year: int, country: str = 'IN', max_age: float = None) -> bool:
+    """Make sure a year of Calendarific holidays is loaded (and younger than max_age).
+    
+    Tries the shared cache before the API; downloads are shared with the other
+    replicas and persisted to the disk tier. Returns True if the calendar changed.
+    """
+    key = (country, year)
+    now = time.time()
+    fetched_time = CALENDARIFIC_FETCHED.get(key)
+    if fetched_time is not None and (max_age is None or now - fetched_time < max_age):
+        return False
+    if now - CALENDARIFIC_FAILED.get(key, 0) < CALENDARIFIC_RETRY_INTERVAL:
+        return False
+    
+    # Another replica may already have downloaded this year
+    shared_holidays = shared_cache_get_many([calendarific_shared_key(country, year)])[0]
+    if shared_holidays is not None:
+        CALENDARIFIC_YEAR_LOADS.labels(source='shared').inc()
+        return remember_calendarific_year(country, year, decode_holiday_year(shared_holidays), now)
+    
+    try:
+        holidays = fetch_calendarific_year(year, country)
+    except Exception as e:
+        CALENDARIFIC_FAILED[key] = now
+        CALENDARIFIC_YEAR_LOADS.labels(source='error').inc()
+        logger.warning(f"⚠️ Calendarific download for {country} {year} failed: {e}")
+        return False
+    CALENDARIFIC_YEAR_LOADS.labels(source='api').inc()
+    
+    # Expire the shared copy with the refresh interval, so one replica re-downloads it
+    shared_cache_set_many({calendarific_shared_key(country, year): encode_holiday_year(holidays)}, CALENDARIFIC_REFRESH_INTERVAL)
+    if DISK_CACHE_PATH:
+        disk_cache_write([('calendarific', f"{country}:{year}", holidays, now)])
+    return remember_calendarific_year(country, year, holidays, now)
+
+def refresh_calendarific(country: str = 'IN'):
+    """Load (or re-download when older than the refresh interval) this year and next"""
+    this_year = datetime.now().year
+    changed = [
+        year for year in (this_year, this_year + 1)
+        if load_calendarific_year(year, country, max_age=CALENDARIFIC_REFRESH_INTERVAL)
+    ]
+    if changed:
+        festival_calendar_changed(changed)
+
+def calendar_years_pending(years, country: str = 'IN') -> List[int]:
+    """Years whose Calendarific holidays were never loaded and aren't in the retry
+    backoff (memory check only - lets async callers skip a thread hop)"""
+    if not CALENDARIFIC_API_KEY:
+        return []
+    now = time.time()
+    return [
+        year for year in years
+        if (country, year) not in CALENDARIFIC_FETCHED
+        and now - CALENDARIFIC_FAILED.get((country, year), 0) >= CALENDARIFIC_RETRY_INTERVAL
+    ]
+
+def load_calendar_years(years, country: str = 'IN'):
+    """Load the Calendarific holidays of years that were never loaded (blocking).
+    
+    Called before anything derived from those years' calendar is computed or looked
+    up (cache keys, calendar tables, festival lists); only years that changed are
+    invalidated.
+    """
+    changed = [year for year in calendar_years_pending(years, country) if load_calendarific_year(year, country)]
+    if changed:
+        festival_calendar_changed(changed)
+
+async def calendarific_refresh_loop():
+    """Background task keeping the Calendarific holidays current"""
+    while True:
+        await run_blocking(refresh_calendarific)
+        await asyncio.sleep(min(CALENDARIFIC_REFRESH_INTERVAL, 3600))
+
+# ============================================================================
+# FESTIVAL CALENDAR INDEX
+# ============================================================================
+
+# Sorted per-country view of the festival calendar: 'YYYY-MM-DD' strings sort
+# chronologically, so next-festival and range lookups are bisects instead of
+# day-by-day probes. Rebuilt as a whole and swapped in by a single assignment.
+# Per-year lists hold only the major festivals (INDIAN_FESTIVALS); Calendarific
+# holidays are in the date-ordered view used by next-festival and range lookups.
+FESTIVAL_INDEX = {}  # country -> {'dates': [...], 'entries': [...], 'major_years': {year: [entries]}}
+
+def build_festival_index() -> Dict[str, Dict[str, Any]]:
+    """Build the festival index from the calendar sources (INDIAN_FESTIVALS wins
+    over Calendarific for the same date)"""
+    by_country = {'IN': {}}
+    with _CALENDARIFIC_LOCK:
+        calendarific = list(CALENDARIFIC_HOLIDAYS.items())
+    for (country, _), holidays in calendarific:
+        for date_str, names in holidays.items():
+            by_country.setdefault(country, {})[date_str] = {'date': date_str, 'name': names[0], 'boost': 1.5}
+    for date_str, data in INDIAN_FESTIVALS.items():
+        by_country['IN'][date_str] = {'date': date_str, 'name': data['name'], 'boost': data['boost']}
+    
+    index = {}
+    for country, by_date in by_country.items():
+        dates = sorted(by_date)
+        major_years = {}
+        if country == 'IN':
+            for date_str in sorted(INDIAN_FESTIVALS):
+                major_years.setdefault(int(date_str[:4]), []).append(by_date[date_str])
+        index[country] = {'dates': dates, 'entries': [by_date[d] for d in dates], 'major_years': major_years}
+    return index
+
+def rebuild_festival_index():
+    """Atomically replace the festival index (after calendar data changes)"""
+    global FESTIVAL_INDEX
+    FESTIVAL_INDEX = build_festival_index()
+
+def festival_next_after(date_str: str, country: str = 'IN') -> Dict[str, Any] | None:
+    """First festival strictly after date_str, or None"""
+    index = FESTIVAL_INDEX.get(country)
+    if not index:
+        return None
+    i = bisect.bisect_right(index['dates'], date_str)
+    return index['entries'][i] if i < len(index['entries']) else None
+
+def festival_range(from_date: str, to_date: str, country: str = 'IN') -> List[Dict[str, Any]]:
+    """Festivals between from_date and to_date (inclusive), in date order"""
+    index = FESTIVAL_INDEX.get(country)
+    if not index:
+        return []
+    lo = bisect.bisect_left(index['dates'], from_date)
+    hi = bisect.bisect_right(index['dates'], to_date)
+    return index['entries'][lo:hi]
+
+def festival_year(year: int, country: str = 'IN') -> List[Dict[str, Any]]:
+    """Major festivals (INDIAN_FESTIVALS) of one year, in date order"""
+    index = FESTIVAL_INDEX.get(country)
+    if not index:
+        return []
+    return index['major_years'].get(year, [])
+
+rebuild_festival_index()
+
 # ============================================================================
 # AWS AUTO SCALING INTEGRATION
 # ============================================================================
@@ -650,325 +1623,911 @@ def calculate_recommended_instances(peak_load: float) -> int:
     else:
         return 10
 
-def get_peak_prediction_with_fallback(timestamp: datetime, model_name: str, boost: float) -> tuple:
-    """Get peak hour prediction with fallback to CatBoost. Returns (avg_load, peak_load)"""
-    try:
-        peak_pred = predict_traffic(timestamp, model_name, use_cache=True)
-        peak_prediction = peak_pred['predicted_load']
-        return peak_prediction * 0.85, peak_prediction * 1.15
-    except Exception as e:
-        logger.warning(f"Error predicting with {model_name}: {e}")
-        if model_name != 'catboost':
-            try:
-                peak_pred = predict_traffic(timestamp, 'catboost', use_cache=True)
-                peak_prediction = peak_pred['predicted_load']
-                return peak_prediction * 0.85, peak_prediction * 1.15
-            except:
-                base_load = 1000.0
-                return base_load * boost, base_load * boost * 1.2
-        else:
-            return 1200.0, 1500.0
-
 # ============================================================================
 # FEATURE ENGINEERING
 # ============================================================================
 
-def prepare_features_for_hour(timestamp: datetime, festival_info: Dict) -> pd.DataFrame:
-    """Prepare features for a single hour prediction - optimized"""
-    hour = timestamp.hour
-    day_of_week = timestamp.weekday()
-    month = timestamp.month
-    
-    # Pre-compute cyclical encoding (faster than sin/cos on each call)
-    hour_sin = np.sin(2 * np.pi * hour / 24)
-    hour_cos = np.cos(2 * np.pi * hour / 24)
-    dow_sin = np.sin(2 * np.pi * day_of_week / 7)
-    dow_cos = np.cos(2 * np.pi * day_of_week / 7)
-    
-    # Fast boolean calculations
-    is_weekend = int(day_of_week >= 5)
-    is_business_hours = int(9 <= hour <= 18)
-    is_peak_hours = int(hour in (12, 13, 19, 20, 21))
-    is_night = int(hour < 6 or hour > 22)
-    
-    # Festival info
-    is_festival = festival_info.get('is_festival', 0)
-    festival_name = festival_info.get('festival_name', 'None')
-    
-    # Use dict literal for faster DataFrame creation
-    features = {
+# Placeholder values for the lag / system metric features (no live telemetry yet)
+FEATURE_DEFAULTS = {
+    'is_campaign': 0,
+    'traffic_lag_1h': 1200.0,
+    'traffic_lag_24h': 1500.0,
+    'traffic_lag_168h': 1400.0,
+    'traffic_rolling_mean_24h': 1300.0,
+    'traffic_rolling_std_24h': 200.0,
+    'traffic_rolling_max_24h': 2000.0,
+    'cpu_usage': 45.0,
+    'memory_usage': 60.0,
+    'response_time': 150.0,
+    'error_rate': 0.5
+}
+
+# Feature matrix dtype. LightGBM stores split thresholds as doubles taken from
+# training values, so float32-rounded sin/cos columns would flip some splits.
+FEATURE_DTYPE = np.float64
+
+# Festival ids stored in the numeric 'festival_name' column of the feature matrix.
+# Ids 0-7 are the fixed XGBoost encoding; other names (e.g. from Calendarific)
+# get new ids in order of first appearance so the original name is never lost.
+FESTIVAL_NAMES = sorted(XGBOOST_FESTIVAL_MAP, key=XGBOOST_FESTIVAL_MAP.get)
+FESTIVAL_IDS = dict(XGBOOST_FESTIVAL_MAP)
+_FESTIVAL_IDS_LOCK = threading.Lock()
+
+def get_festival_id(festival_name: str) -> int:
+    """Get (or assign) the feature-matrix id for a festival name"""
+    festival_name = str(festival_name)
+    festival_id = FESTIVAL_IDS.get(festival_name)
+    if festival_id is None:
+        with _FESTIVAL_IDS_LOCK:
+            festival_id = FESTIVAL_IDS.get(festival_name)
+            if festival_id is None:
+                festival_id = len(FESTIVAL_NAMES)
+                FESTIVAL_NAMES.append(festival_name)
+                FESTIVAL_IDS[festival_name] = festival_id
+    return festival_id
+
+def to_hour64(timestamp: datetime) -> np.datetime64:
+    """Wall-clock hour of a timestamp as datetime64[h] (timezone offset dropped, like the features)"""
+    return np.datetime64(timestamp.replace(tzinfo=None, minute=0, second=0, microsecond=0), 'h')
+
+def hour_range(start: datetime, hours: int) -> np.ndarray:
+    """Vector of consecutive wall-clock hours starting at `start`"""
+    return to_hour64(start) + np.arange(hours)
+
+def festival_columns(hours: np.ndarray, lookup=None) -> Dict[str, np.ndarray]:
+    """Look up festival info once per distinct day and broadcast it to every hour"""
+    lookup = lookup or check_festival_calendarific
+    days = hours.astype('datetime64[D]')
+    unique_days, inverse = np.unique(days, return_inverse=True)
+    infos = [lookup(str(day)) for day in unique_days]
+    return {
+        'is_festival': np.array([info.get('is_festival', 0) for info in infos], dtype=np.int8)[inverse],
+        'festival_id': np.array([get_festival_id(info.get('festival_name', 'None')) for info in infos], dtype=np.int32)[inverse],
+        'boost': np.array([info.get('boost', 1.0) for info in infos], dtype=np.float64)[inverse],
+    }
+
+def build_feature_matrix(hours: np.ndarray, festivals: Dict[str, np.ndarray]) -> np.ndarray:
+    """Build the model input for a vector of hours as a contiguous matrix in FEATURE_COLUMNS order.
+    
+    All calendar columns are computed with vectorized datetime64 arithmetic; the
+    'festival_name' column holds festival ids (see get_festival_id).
+    """
+    hours = np.asarray(hours, dtype='datetime64[h]')
+    days = hours.astype('datetime64[D]')
+    day_index = days.astype(np.int64)
+    
+    hour = (hours - days).astype(np.int64)
+    day_of_week = (day_index + 3) % 7  # 1970-01-01 was a Thursday
+    month = days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    # ISO week number is the week of the year that contains that week's Thursday
+    thursday = days - (day_of_week - 3).astype('timedelta64[D]')
+    week_of_year = (thursday - thursday.astype('datetime64[Y]')).astype(np.int64) // 7 + 1
+    
+    columns = {
         'hour': hour,
         'day_of_week': day_of_week,
         'month': month,
-        'day': timestamp.day,
-        'year': timestamp.year,
-        'week_of_year': timestamp.isocalendar()[1],
+        'day': (days - days.astype('datetime64[M]')).astype(np.int64) + 1,
+        'year': days.astype('datetime64[Y]').astype(np.int64) + 1970,
+        'week_of_year': week_of_year,
         'quarter': (month - 1) // 3 + 1,
-        'day_of_year': timestamp.timetuple().tm_yday,
-        'hour_sin': hour_sin,
-        'hour_cos': hour_cos,
-        'dow_sin': dow_sin,
-        'dow_cos': dow_cos,
-        'is_weekend': is_weekend,
-        'is_business_hours': is_business_hours,
-        'is_peak_hours': is_peak_hours,
-        'is_night': is_night,
-        'is_festival': is_festival,
-        'is_campaign': 0,
-        'festival_name': festival_name,
-        'traffic_lag_1h': 1200.0,
-        'traffic_lag_24h': 1500.0,
-        'traffic_lag_168h': 1400.0,
-        'traffic_rolling_mean_24h': 1300.0,
-        'traffic_rolling_std_24h': 200.0,
-        'traffic_rolling_max_24h': 2000.0,
-        'cpu_usage': 45.0,
-        'memory_usage': 60.0,
-        'response_time': 150.0,
-        'error_rate': 0.5
+        'day_of_year': (days - days.astype('datetime64[Y]')).astype(np.int64) + 1,
+        'hour_sin': np.sin(2 * np.pi * hour / 24),
+        'hour_cos': np.cos(2 * np.pi * hour / 24),
+        'dow_sin': np.sin(2 * np.pi * day_of_week / 7),
+        'dow_cos': np.cos(2 * np.pi * day_of_week / 7),
+        'is_weekend': day_of_week >= 5,
+        'is_business_hours': (hour >= 9) & (hour <= 18),
+        'is_peak_hours': np.isin(hour, (12, 13, 19, 20, 21)),
+        'is_night': (hour < 6) | (hour > 22),
+        'is_festival': festivals['is_festival'],
+        'festival_name': festivals['festival_id'],
     }
     
-    # Create DataFrame directly from dict (faster than list of dicts)
-    return pd.DataFrame([features])
+    matrix = np.empty((len(hours), len(FEATURE_COLUMNS)), dtype=FEATURE_DTYPE)
+    for idx, col in enumerate(FEATURE_COLUMNS):
+        matrix[:, idx] = columns[col] if col in columns else FEATURE_DEFAULTS[col]
+    return matrix
 
 # ============================================================================
-# PREDICTION FUNCTION
+# MODEL INPUT ENCODERS
 # ============================================================================
 
-def predict_traffic(timestamp: datetime, model_name: str = 'catboost', use_cache: bool = True) -> Dict[str, Any]:
-    """Predict traffic for a given timestamp using specified model"""
-    
-    if not MODELS or not FEATURE_COLUMNS:
-        raise HTTPException(status_code=500, detail="Models not loaded")
-    
-    # Check if model has failed too many times - auto-fallback to CatBoost
-    if model_name != 'catboost' and model_name in MODEL_FAILURE_COUNT:
-        if MODEL_FAILURE_COUNT[model_name] >= MAX_FAILURES:
-            logger.debug(f"Model {model_name} has failed {MODEL_FAILURE_COUNT[model_name]} times, using CatBoost instead")
-            model_name = 'catboost'
-    
-    if model_name not in MODELS:
-        raise HTTPException(status_code=400, detail=f"Model '{model_name}' not found")
-    
-    # Check cache first (optimized)
-    if use_cache:
-        cache_key = get_cache_key(timestamp, model_name)
-        if cache_key in PREDICTION_CACHE:
-            cached_result, cached_time = PREDICTION_CACHE[cache_key]
-            current_time = datetime.now(timezone.utc).timestamp()
-            # Quick TTL check without full cleanup
-            if current_time - cached_time < CACHE_TTL:
-                return cached_result
-            else:
-                # Expired, remove from cache
-                del PREDICTION_CACHE[cache_key]
-        
-        # Periodic cleanup (only every 5 minutes)
-        clear_old_cache()
-    
-    # Check festival
-    date_str = timestamp.strftime('%Y-%m-%d')
-    festival_info = check_festival_calendarific(date_str)
+MODEL_INPUT_ENCODE_SECONDS = Histogram(
+    'model_input_encode_seconds', 'Time spent turning the feature matrix into model input', ['model'],
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+
+def build_model_encoder(model_name: str):
+    """Build the function that turns a feature matrix into a model's native input.
     
-    # Prepare features
-    features_df = prepare_features_for_hour(timestamp, festival_info)
+    Everything that depends only on FEATURE_COLUMNS and XGBOOST_FESTIVAL_MAP (column
+    positions, the known festival codes) is resolved here, once per loaded model.
+    """
+    festival_col = FEATURE_COLUMNS.index('festival_name') if 'festival_name' in FEATURE_COLUMNS else None
+    known_codes = len(XGBOOST_FESTIVAL_MAP)
     
-    # Ensure columns match training
-    features_df = features_df[FEATURE_COLUMNS]
+    def encode_festival_codes(matrix: np.ndarray) -> np.ndarray:
+        # Festival ids below known_codes already equal XGBOOST_FESTIVAL_MAP codes;
+        # ids of other festivals were never seen in training and encode as 0 ('None')
+        if festival_col is None or not (matrix[:, festival_col] >= known_codes).any():
+            return matrix
+        matrix = matrix.copy()
+        column = matrix[:, festival_col]
+        column[column >= known_codes] = 0
+        return matrix
     
-    # Predict
-    model = MODELS[model_name]
+    if model_name == 'catboost':
+        if festival_col is None:
+            return lambda matrix: matrix.astype(np.float32, copy=False)
+        # CatBoost's columnar input: float32 numeric block plus festival names as the
+        # categorical column (matched to the model by feature name, not position)
+        from catboost import FeaturesData
+        numeric_cols = [i for i in range(len(FEATURE_COLUMNS)) if i != festival_col]
+        numeric_names = [FEATURE_COLUMNS[i] for i in numeric_cols]
+        def encode_catboost(matrix: np.ndarray):
+            festival_names = np.asarray(FESTIVAL_NAMES, dtype=object)[matrix[:, festival_col].astype(np.int64)]
+            return FeaturesData(
+                num_feature_data=np.ascontiguousarray(matrix[:, numeric_cols], dtype=np.float32),
+                cat_feature_data=festival_names.reshape(-1, 1),
+                num_feature_names=numeric_names,
+                cat_feature_names=['festival_name']
+            )
+        return encode_catboost
+    if model_name == 'lightgbm':
+        return encode_festival_codes
+    if model_name == 'xgboost':
+        def encode_xgboost(matrix: np.ndarray) -> np.ndarray:
+            # XGBoost evaluates in float32 anyway
+            return encode_festival_codes(matrix).astype(np.float32, copy=False)
+        return encode_xgboost
+    if model_name == 'lstm':
+        def encode_lstm(matrix: np.ndarray) -> np.ndarray:
+            # (samples, timesteps=1, features)
+            return encode_festival_codes(matrix).astype(np.float32, copy=False).reshape(len(matrix), 1, -1)
+        return encode_lstm
+    raise ValueError(f"No input encoder for model '{model_name}'")
+
+MODEL_ENCODERS = {name: build_model_encoder(name) for name in MODELS} if MODELS and FEATURE_COLUMNS else {}
+
+def encode_model_input(model_name: str, matrix: np.ndarray):
+    """Encode a feature matrix for a model, recording the encoding time"""
+    with MODEL_INPUT_ENCODE_SECONDS.labels(model=model_name).time():
+        return MODEL_ENCODERS[model_name](matrix)
+
+# ============================================================================
+# INFERENCE ENGINE
+# ============================================================================
+
+MODEL_INFERENCE_SECONDS = Histogram(
+    'model_inference_seconds', 'Model predict call latency (input already encoded)', ['model'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+
+def build_model_runner(model_name: str, model):
+    """Bind a loaded model to its library's fastest array entry point.
     
+    Runners take the output of the model's encoder and return a flat float array.
+    """
     if model_name == 'catboost':
-        prediction = model.predict(features_df)[0]
-    elif model_name == 'lightgbm':
-        # LightGBM needs categorical features to be handled properly
-        try:
-            # Convert festival_name to numeric if it exists
-            features_for_lgbm = features_df.copy()
-            if 'festival_name' in features_for_lgbm.columns:
-                # Map festival names to numeric values
-                festival_map = {
-                    'None': 0, 'Diwali': 1, 'Holi': 2, 'Christmas': 3,
-                    'Independence Day': 4, 'Republic Day': 5, 'Ram Navami': 6, 'Diwali Weekend': 7
-                }
-                features_for_lgbm['festival_name'] = features_for_lgbm['festival_name'].map(
-                    lambda x: festival_map.get(str(x), 0)
-                ).fillna(0).astype(int)
-            
-            # Ensure all columns are numeric for LightGBM
-            for col in features_for_lgbm.columns:
-                if pd.api.types.is_categorical_dtype(features_for_lgbm[col]):
-                    features_for_lgbm[col] = features_for_lgbm[col].astype(int)
-                elif features_for_lgbm[col].dtype == 'object':
-                    features_for_lgbm[col] = pd.to_numeric(features_for_lgbm[col], errors='coerce').fillna(0)
-                elif not pd.api.types.is_numeric_dtype(features_for_lgbm[col]):
-                    features_for_lgbm[col] = pd.to_numeric(features_for_lgbm[col], errors='coerce').fillna(0)
-            
-            # Use appropriate prediction method
-            if hasattr(model, 'best_iteration'):
-                prediction = model.predict(features_for_lgbm, num_iteration=model.best_iteration)[0]
-            else:
-                prediction = model.predict(features_for_lgbm)[0]
-            
-            # Reset failure count on success
-            if 'lightgbm' in MODEL_FAILURE_COUNT:
-                MODEL_FAILURE_COUNT['lightgbm'] = 0
-            logger.debug(f"LightGBM prediction successful: {prediction}")
-        except Exception as e:
-            # Track failure count
-            if 'lightgbm' not in MODEL_FAILURE_COUNT:
-                MODEL_FAILURE_COUNT['lightgbm'] = 0
-            MODEL_FAILURE_COUNT['lightgbm'] += 1
-            
-            logger.warning(f"LightGBM prediction error: {e}, falling back to CatBoost (failure count: {MODEL_FAILURE_COUNT['lightgbm']})")
-            # Fallback to CatBoost if LightGBM fails
-            if 'catboost' in MODELS:
-                catboost_model = MODELS['catboost']
-                prediction = catboost_model.predict(features_df)[0]
-                model_name = 'catboost'  # Update model name for result
-            else:
-                raise Exception(f"LightGBM failed and CatBoost not available: {e}")
-    elif model_name == 'xgboost':
-        try:
-            import xgboost as xgb
-            
-            # Suppress XGBoost warnings during prediction
+        return model.predict
+    if model_name == 'lightgbm':
+        # Resolve the iteration count once instead of on every call
+        num_iteration = getattr(model, 'best_iteration', None)
+        def run_lightgbm(features: np.ndarray) -> np.ndarray:
+            return model.predict(features, num_iteration=num_iteration)
+        return run_lightgbm
+    if model_name == 'xgboost':
+        def run_xgboost(features: np.ndarray) -> np.ndarray:
+            # Suppress XGBoost warnings about serialized models
             with warnings.catch_warnings():
                 warnings.filterwarnings('ignore', category=UserWarning, module='xgboost')
-                
-                # Encode festival_name using fixed mapping (not LabelEncoder)
-                features_encoded = features_df.copy()
-                if 'festival_name' in features_encoded.columns:
-                    festival_val = str(features_encoded['festival_name'].iloc[0])
-                    encoded_val = encode_festival_name_for_xgboost(festival_val)
-                    features_encoded['festival_name'] = encoded_val
-                
-                # Ensure all columns are numeric and in correct order
-                for col in features_encoded.columns:
-                    if not pd.api.types.is_numeric_dtype(features_encoded[col]):
-                        features_encoded[col] = pd.to_numeric(features_encoded[col], errors='coerce').fillna(0)
-                
-                # Ensure feature order matches training (use FEATURE_COLUMNS order)
-                features_encoded = features_encoded[FEATURE_COLUMNS]
-                
-                # Create DMatrix with feature names for better compatibility
-                dmatrix = xgb.DMatrix(features_encoded, feature_names=FEATURE_COLUMNS)
-                prediction = model.predict(dmatrix)[0]
-                
-                # Ensure prediction is positive (XGBoost might return negative values)
-                prediction = max(prediction, 0.0)
-                
-                # Reset failure count on success
-                if 'xgboost' in MODEL_FAILURE_COUNT:
-                    MODEL_FAILURE_COUNT['xgboost'] = 0
-                logger.debug(f"XGBoost prediction successful: {prediction}")
-        except Exception as e:
-            # Track failure count
-            if 'xgboost' not in MODEL_FAILURE_COUNT:
-                MODEL_FAILURE_COUNT['xgboost'] = 0
-            MODEL_FAILURE_COUNT['xgboost'] += 1
-            
-            logger.warning(f"XGBoost prediction error: {e}, falling back to CatBoost (failure count: {MODEL_FAILURE_COUNT['xgboost']})")
-            # Fallback to CatBoost if XGBoost fails
-            if 'catboost' in MODELS:
-                catboost_model = MODELS['catboost']
-                prediction = catboost_model.predict(features_df)[0]
-                model_name = 'catboost'  # Update model name for result
-            else:
-                raise Exception(f"XGBoost failed and CatBoost not available: {e}")
-    elif model_name == 'lstm':
+                predictions = model.inplace_predict(features)
+            # XGBoost might return negative values
+            return np.maximum(predictions, 0.0)
+        return run_xgboost
+    if model_name == 'lstm':
+        def run_lstm(features: np.ndarray) -> np.ndarray:
+            predictions = np.asarray(model.predict(features, verbose=0), dtype=np.float32)
+            return np.maximum(predictions.reshape(len(features), -1)[:, 0], 0.0)
+        return run_lstm
+    raise ValueError(f"No runner for model '{model_name}'")
+
+MODEL_RUNNERS = {name: build_model_runner(name, model) for name, model in MODELS.items()} if MODELS and FEATURE_COLUMNS else {}
+
+def predict_matrix(model_name: str, feature_matrix: np.ndarray) -> np.ndarray:
+    """Run one model on a feature matrix (no fallback), in a worker process if configured"""
+    if INFERENCE_PROCESS_POOL is not None:
+        extra_festival_names = FESTIVAL_NAMES[len(XGBOOST_FESTIVAL_MAP):]
+        return submit_job(
+            INFERENCE_PROCESS_POOL, 'process', _predict_matrix_in_worker, model_name, feature_matrix, extra_festival_names
+        ).result()
+    return predict_matrix_local(model_name, feature_matrix)
+
+def predict_matrix_local(model_name: str, feature_matrix: np.ndarray) -> np.ndarray:
+    """Encode a feature matrix and run one model on it in this process"""
+    features = encode_model_input(model_name, feature_matrix)
+    with MODEL_INFERENCE_SECONDS.labels(model=model_name).time():
+        return np.asarray(MODEL_RUNNERS[model_name](features), dtype=np.float64).reshape(-1)
+
+def run_inference(model_name: str, feature_matrix: np.ndarray) -> tuple:
+    """Predict with a model, falling back to CatBoost when it fails.
+    
+    Models that failed MAX_FAILURES times in a row are skipped; a success resets the count.
+    Returns (predictions, model_used).
+    """
+    if model_name != 'catboost' and MODEL_FAILURE_COUNT.get(model_name, 0) >= MAX_FAILURES:
+        logger.debug(f"Model {model_name} has failed {MODEL_FAILURE_COUNT[model_name]} times, using CatBoost instead")
+        model_name = 'catboost'
+    
+    if model_name == 'catboost' or 'catboost' not in MODEL_RUNNERS:
+        return predict_matrix(model_name, feature_matrix), model_name
+    
+    if model_name in MODEL_RUNNERS:
         try:
-            import tensorflow as tf
-            
-            # LSTM models need numeric features - encode festival_name
-            features_for_lstm = features_df.copy()
-            if 'festival_name' in features_for_lstm.columns:
-                # Use same encoding as XGBoost for consistency
-                features_for_lstm['festival_name'] = features_for_lstm['festival_name'].astype(str).map(
-                    lambda x: encode_festival_name_for_xgboost(x)
-                ).fillna(0).astype(int)
-            
-            # Ensure all columns are numeric
-            for col in features_for_lstm.columns:
-                if not pd.api.types.is_numeric_dtype(features_for_lstm[col]):
-                    features_for_lstm[col] = pd.to_numeric(features_for_lstm[col], errors='coerce').fillna(0)
-            
-            # Prepare features as numpy array in correct order
-            features_array = features_for_lstm[FEATURE_COLUMNS].values.astype(np.float32)
-            
-            # Reshape for LSTM: (samples, timesteps, features)
-            # For single prediction, we use 1 timestep with all features
-            # If model expects sequence, we'll need to adjust
-            if len(features_array.shape) == 2:
-                # Reshape to (1, 1, n_features) for LSTM
-                features_array = features_array.reshape(1, 1, -1)
-            
-            prediction = model.predict(features_array, verbose=0)[0][0]
-            
-            # Ensure prediction is positive and scalar
-            if isinstance(prediction, (list, np.ndarray)):
-                prediction = float(prediction[0] if len(prediction) > 0 else prediction)
-            else:
-                prediction = float(prediction)
-            
-            prediction = max(prediction, 0.0)
-            
+            predictions = predict_matrix(model_name, feature_matrix)
             # Reset failure count on success
-            if 'lstm' in MODEL_FAILURE_COUNT:
-                MODEL_FAILURE_COUNT['lstm'] = 0
-            logger.debug(f"LSTM prediction successful: {prediction}")
+            if model_name in MODEL_FAILURE_COUNT:
+                MODEL_FAILURE_COUNT[model_name] = 0
+            return predictions, model_name
         except Exception as e:
             # Track failure count
-            if 'lstm' not in MODEL_FAILURE_COUNT:
-                MODEL_FAILURE_COUNT['lstm'] = 0
-            MODEL_FAILURE_COUNT['lstm'] += 1
-            
-            logger.warning(f"LSTM prediction error: {e}, falling back to CatBoost (failure count: {MODEL_FAILURE_COUNT['lstm']})")
-            # Fallback to CatBoost if LSTM fails
-            if 'catboost' in MODELS:
-                catboost_model = MODELS['catboost']
-                prediction = catboost_model.predict(features_df)[0]
-                model_name = 'catboost'  # Update model name for result
-            else:
-                raise Exception(f"LSTM failed and CatBoost not available: {e}")
-    
-    # Ensure positive prediction
-    prediction = max(prediction, 50.0)
-    
-    # Apply festival boost multiplier
-    boost = festival_info.get('boost', 1.0)
-    if boost > 1.0:
-        prediction = prediction * boost
-    
-    result = {
-        'timestamp': timestamp.isoformat(),
-        'hour': timestamp.hour,
-        'predicted_load': float(prediction),
-        'is_festival': festival_info['is_festival'],
-        'festival_name': festival_info['festival_name'],
-        'boost': boost,
-        'model': model_name,
-        'reasoning': ''  # Will be filled below
-    }
-    
-    # Generate AI reasoning for single prediction
-    try:
-        reasoning = generate_prediction_reasoning(result)
-        result['reasoning'] = reasoning
-    except Exception as e:
-        logger.debug(f"Failed to generate reasoning: {e}")
-        result['reasoning'] = ""
-    
-    # Cache the result
-    if use_cache:
-        cache_key = get_cache_key(timestamp, model_name)
-        PREDICTION_CACHE[cache_key] = (result, datetime.now(timezone.utc).timestamp())
+            MODEL_FAILURE_COUNT[model_name] = MODEL_FAILURE_COUNT.get(model_name, 0) + 1
+            logger.warning(f"{model_name} prediction failed: {e}, falling back to CatBoost (failure count: {MODEL_FAILURE_COUNT[model_name]})")
     
-    return result
+    # Fallback to CatBoost for reliability
+    return predict_matrix('catboost', feature_matrix), 'catboost'
 
 # ============================================================================
-# PYDANTIC MODELS
+# INFERENCE EXECUTOR
+# ============================================================================
+
+# Blocking work (feature slicing, model calls, outbound HTTP) never runs on the
+# event loop. It goes to a bounded thread pool; with INFERENCE_EXECUTOR=process
+# the model calls themselves additionally run in worker processes (each with its
+# own preloaded copy of the models) so CPU-bound prediction uses several cores.
+INFERENCE_EXECUTOR = os.environ.get('INFERENCE_EXECUTOR', 'thread')  # thread | process
+INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', str(min(8, os.cpu_count() or 1))))
+INFERENCE_THREAD_POOL = None
+INFERENCE_PROCESS_POOL = None
+
+INFERENCE_EXECUTOR_QUEUE_DEPTH = Gauge(
+    'inference_executor_queue_depth', 'Jobs submitted to the inference executor and not finished yet', ['pool']
+)
+INFERENCE_EXECUTOR_WAIT_SECONDS = Histogram(
+    'inference_executor_wait_seconds', 'Time jobs waited for a free executor worker', ['pool'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+def _executor_job(submitted_at: float, func, *args):
+    """Runs inside the worker: report how long the job queued, then run it"""
+    return time.time() - submitted_at, func(*args)
+
+def _init_inference_worker():
+    """Process worker initializer: importing this module loaded the models; warm them up"""
+    if not MODEL_RUNNERS:
+        return
+    warmup, _ = calendar_window(datetime(datetime.now().year, 1, 1), 1)
+    for model_name in MODEL_RUNNERS:
+        try:
+            predict_matrix_local(model_name, warmup)
+        except Exception as e:
+            logger.warning(f"Inference worker could not warm up {model_name}: {e}")
+
+def _predict_matrix_in_worker(model_name: str, feature_matrix: np.ndarray, extra_festival_names: List[str]) -> np.ndarray:
+    """predict_matrix_local() in a worker process, after syncing festival ids from the parent"""
+    for festival_name in extra_festival_names[len(FESTIVAL_NAMES) - len(XGBOOST_FESTIVAL_MAP):]:
+        get_festival_id(festival_name)
+    return predict_matrix_local(model_name, feature_matrix)
+
+def start_inference_executor():
+    """Create the executor pools (called at startup, never in worker processes)"""
+    global INFERENCE_THREAD_POOL, INFERENCE_PROCESS_POOL
+    INFERENCE_THREAD_POOL = concurrent.futures.ThreadPoolExecutor(
+        max_workers=INFERENCE_WORKERS, thread_name_prefix='inference'
+    )
+    if INFERENCE_EXECUTOR == 'process' and MODEL_RUNNERS:
+        INFERENCE_PROCESS_POOL = concurrent.futures.ProcessPoolExecutor(
+            max_workers=INFERENCE_WORKERS,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_inference_worker
+        )
+    logger.info(f"Inference executor: {INFERENCE_EXECUTOR} ({INFERENCE_WORKERS} workers)")
+
+def stop_inference_executor():
+    global INFERENCE_THREAD_POOL, INFERENCE_PROCESS_POOL
+    for pool in (INFERENCE_PROCESS_POOL, INFERENCE_THREAD_POOL):
+        if pool:
+            pool.shutdown(wait=False, cancel_futures=True)
+    INFERENCE_THREAD_POOL = None
+    INFERENCE_PROCESS_POOL = None
+
+def submit_job(pool, pool_name: str, func, *args) -> concurrent.futures.Future:
+    """Submit a job to an executor pool with queue-depth and wait-time tracking"""
+    depth = INFERENCE_EXECUTOR_QUEUE_DEPTH.labels(pool=pool_name)
+    depth.inc()
+    future = pool.submit(_executor_job, time.time(), func, *args)
+    
+    unwrapped = concurrent.futures.Future()
+    def _done(f):
+        depth.dec()
+        if f.cancelled():
+            unwrapped.cancel()
+        elif f.exception() is not None:
+            unwrapped.set_exception(f.exception())
+        else:
+            waited, result = f.result()
+            INFERENCE_EXECUTOR_WAIT_SECONDS.labels(pool=pool_name).observe(waited)
+            unwrapped.set_result(result)
+    future.add_done_callback(_done)
+    return unwrapped
+
+async def run_blocking(func, *args):
+    """Run blocking work on the inference thread pool without blocking the event loop"""
+    if INFERENCE_THREAD_POOL is None:
+        return await asyncio.to_thread(func, *args)
+    return await asyncio.wrap_future(submit_job(INFERENCE_THREAD_POOL, 'thread', func, *args))
+
+# ============================================================================
+# MICRO-BATCHING SCHEDULER
+# ============================================================================
+
+# Small predictions (short /predict windows, 24-hour festival windows) arriving
+# from concurrent requests are collected for up to INFERENCE_BATCH_WINDOW_MS
+# or INFERENCE_BATCH_MAX_ROWS rows and run as one predict call per model. The first
+# caller of a batch waits out the window and runs it; the others wait for their slice.
+INFERENCE_BATCH_WINDOW = float(os.environ.get('INFERENCE_BATCH_WINDOW_MS', '2')) / 1000  # 0 disables batching
+INFERENCE_BATCH_MAX_ROWS = int(os.environ.get('INFERENCE_BATCH_MAX_ROWS', '2048'))
+_PENDING_BATCHES = {}  # model_name -> {'requests': [(matrix, future, enqueued_at)], 'rows', 'full'}
+_PENDING_BATCHES_LOCK = threading.Lock()
+
+INFERENCE_BATCH_ROWS = Histogram(
+    'inference_batch_rows', 'Rows per micro-batched predict call', ['model'],
+    buckets=(1, 2, 4, 8, 16, 24, 48, 96, 168, 256, 512, 1024, 2048, 4096)
+)
+INFERENCE_BATCH_REQUESTS = Histogram(
+    'inference_batch_requests', 'Callers merged into one micro-batched predict call', ['model'],
+    buckets=(1, 2, 3, 4, 6, 8, 12, 16, 32, 64)
+)
+INFERENCE_BATCH_WAIT_SECONDS = Histogram(
+    'inference_batch_wait_seconds', 'Time rows waited for their micro-batch to start', ['model'],
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+
+def batched_inference(model_name: str, feature_matrix: np.ndarray) -> tuple:
+    """run_inference() through the micro-batching scheduler (blocking).
+    
+    Large matrices, or any call when batching is disabled, run directly.
+    Returns (predictions, model_used).
+    """
+    if INFERENCE_BATCH_WINDOW <= 0 or len(feature_matrix) >= INFERENCE_BATCH_MAX_ROWS:
+        return run_inference(model_name, feature_matrix)
+    
+    future = concurrent.futures.Future()
+    with _PENDING_BATCHES_LOCK:
+        batch = _PENDING_BATCHES.get(model_name)
+        is_leader = batch is None
+        if is_leader:
+            batch = {'requests': [], 'rows': 0, 'full': threading.Event()}
+            _PENDING_BATCHES[model_name] = batch
+        batch['requests'].append((feature_matrix, future, time.monotonic()))
+        batch['rows'] += len(feature_matrix)
+        if batch['rows'] >= INFERENCE_BATCH_MAX_ROWS:
+            # Close the batch now; later callers start a new one
+            del _PENDING_BATCHES[model_name]
+            batch['full'].set()
+    
+    if is_leader:
+        batch['full'].wait(INFERENCE_BATCH_WINDOW)
+        with _PENDING_BATCHES_LOCK:
+            if _PENDING_BATCHES.get(model_name) is batch:
+                del _PENDING_BATCHES[model_name]
+        run_inference_batch(model_name, batch['requests'])
+    return future.result()
+
+def run_inference_batch(model_name: str, requests_in_batch: list):
+    """Run one predict call for a closed batch and scatter the results to its callers"""
+    started = time.monotonic()
+    rows = 0
+    for feature_matrix, _, enqueued_at in requests_in_batch:
+        INFERENCE_BATCH_WAIT_SECONDS.labels(model=model_name).observe(started - enqueued_at)
+        rows += len(feature_matrix)
+    INFERENCE_BATCH_ROWS.labels(model=model_name).observe(rows)
+    INFERENCE_BATCH_REQUESTS.labels(model=model_name).observe(len(requests_in_batch))
+    
+    try:
+        if len(requests_in_batch) == 1:
+            feature_matrix = requests_in_batch[0][0]
+        else:
+            feature_matrix = np.concatenate([request[0] for request in requests_in_batch])
+        predictions, model_used = run_inference(model_name, feature_matrix)
+    except Exception as e:
+        for _, future, _ in requests_in_batch:
+            future.set_exception(e)
+        return
+    
+    offset = 0
+    for request_matrix, future, _ in requests_in_batch:
+        future.set_result((predictions[offset:offset + len(request_matrix)], model_used))
+        offset += len(request_matrix)
+
+# ============================================================================
+# CALENDAR FEATURE TABLE
+# ============================================================================
+
+# Every feature except the constant placeholders is a pure function of the hour
+# and the festival calendar, so each year is computed once as a dense table
+# (8760/8784 rows) and prediction windows become array slices of it.
+CALENDAR_TABLES = OrderedDict()  # year -> {'version', 'features', 'is_festival', 'festival_id', 'boost'}, least- to most-recently used
+CALENDAR_TABLE_MAX_YEARS = int(os.environ.get('CALENDAR_TABLE_MAX_YEARS', '4'))  # current and next year are always kept
+FESTIVAL_CALENDAR_VERSION = 0  # Bumped when the whole calendar changes
+FESTIVAL_CALENDAR_YEAR_VERSIONS = {}  # year -> bumped when that year's calendar changes
+FESTIVAL_CALENDAR_FINGERPRINTS = {}  # year -> content hash of that year's calendar, computed on first use
+_CALENDAR_TABLES_LOCK = threading.Lock()
+
+def festival_calendar_version(year: int) -> tuple:
+    """In-process version of one year of the festival calendar (recorded by calendar
+    tables and forecast store entries)"""
+    return (FESTIVAL_CALENDAR_VERSION, FESTIVAL_CALENDAR_YEAR_VERSIONS.get(year, 0))
+
+def festival_calendar_fingerprint(year: int) -> str:
+    """Content hash of one year of the festival calendar, stable across processes (part
+    of the prediction cache version, so shared and on-disk entries follow calendar edits)"""
+    fingerprint = FESTIVAL_CALENDAR_FINGERPRINTS.get(year)
+    if fingerprint is None:
+        with _CALENDAR_TABLES_LOCK:
+            prefix = f"{year}-"
+            with _CALENDARIFIC_LOCK:
+                holidays = sorted(item for item in CALENDARIFIC_HOLIDAYS.items() if item[0][1] == year)
+            digest = hashlib.sha256(repr(sorted(item for item in INDIAN_FESTIVALS.items() if item[0].startswith(prefix))).encode())
+            digest.update(repr(holidays).encode())
+            fingerprint = FESTIVAL_CALENDAR_FINGERPRINTS[year] = digest.hexdigest()[:8]
+    return fingerprint
+
+def festival_calendar_changed(years=None):
+    """Invalidate everything derived from the festival calendar of `years` (all years if None).
+    
+    Must be called after INDIAN_FESTIVALS (or any other calendar source) is modified.
+    Cache keys, calendar tables and forecast store rows of other years stay valid.
+    """
+    global FESTIVAL_CALENDAR_VERSION
+    with _CALENDAR_TABLES_LOCK:
+        if years is None:
+            FESTIVAL_CALENDAR_VERSION += 1
+            FESTIVAL_CALENDAR_FINGERPRINTS.clear()
+            CALENDAR_TABLES.clear()
+            CALENDAR_TABLE_BYTES.clear()
+        else:
+            for year in years:
+                FESTIVAL_CALENDAR_YEAR_VERSIONS[year] = FESTIVAL_CALENDAR_YEAR_VERSIONS.get(year, 0) + 1
+                FESTIVAL_CALENDAR_FINGERPRINTS.pop(year, None)
+                if CALENDAR_TABLES.pop(year, None) is not None:
+                    CALENDAR_TABLE_BYTES.remove(str(year))
+    rebuild_festival_index()
+    logger.info(f"Festival calendar changed ({'all years' if years is None else ', '.join(map(str, years))}), calendar tables will be rebuilt")
+
+def build_calendar_table(year: int) -> Dict[str, Any]:
+    """Compute the feature table for every hour of a year"""
+    version = festival_calendar_version(year)
+    year_start = np.datetime64(str(year), 'Y')
+    hours = np.arange(year_start.astype('datetime64[h]'), (year_start + 1).astype('datetime64[h]'))
+    festivals = festival_columns(hours, lookup=calendar_festival_info)
+    table = {'version': version, 'features': build_feature_matrix(hours, festivals)}
+    table.update(festivals)
+    return table
+
+def get_calendar_table(year: int) -> Dict[str, Any]:
+    """Get the calendar table for a year, building it on first use or after a calendar change.
+    
+    At most CALENDAR_TABLE_MAX_YEARS tables are kept; tables of other years are
+    evicted least recently used first (callers keep theirs while they use it).
+    """
+    with _CALENDAR_TABLES_LOCK:
+        table = CALENDAR_TABLES.get(year)
+        if table is None or table['version'] != festival_calendar_version(year):
+            table = build_calendar_table(year)
+            CALENDAR_TABLES[year] = table
+            CALENDAR_TABLE_BYTES.labels(year=str(year)).set(calendar_table_nbytes(table))
+            logger.info(f"Built calendar feature table for {year} ({len(table['boost'])} hours)")
+        CALENDAR_TABLES.move_to_end(year)
+        evict_calendar_tables()
+    return table
+
+def evict_calendar_tables():
+    """Drop least recently used tables beyond CALENDAR_TABLE_MAX_YEARS, never the
+    current or next year's (caller holds _CALENDAR_TABLES_LOCK)"""
+    current_year = datetime.now().year
+    pinned = (current_year, current_year + 1)
+    evictable = [year for year in CALENDAR_TABLES if year not in pinned]
+    excess = len(CALENDAR_TABLES) - max(CALENDAR_TABLE_MAX_YEARS, len(pinned))
+    for year in evictable[:max(excess, 0)]:
+        del CALENDAR_TABLES[year]
+        CALENDAR_TABLE_BYTES.remove(str(year))
+
+def calendar_table_nbytes(table: Dict[str, Any]) -> int:
+    """Memory held by one calendar table's arrays"""
+    return sum(v.nbytes for v in table.values() if isinstance(v, np.ndarray))
+
+def calendar_table_stats() -> Dict[str, Dict[str, int]]:
+    """Rows and bytes per cached year (reported in /health)"""
+    return {
+        str(year): {'rows': len(table['boost']), 'bytes': calendar_table_nbytes(table)}
+        for year, table in sorted(CALENDAR_TABLES.items())
+    }
+
+def calendar_window(start: datetime, hours: int) -> tuple:
+    """Feature matrix and festival columns for `hours` consecutive hours from `start`.
+    
+    Returns views into the calendar table when the window stays inside one year;
+    windows crossing a year boundary are concatenated from both tables.
+    Returns (feature_matrix, festivals).
+    """
+    pos = to_hour64(start)
+    end = pos + max(hours, 0)
+    segments = []
+    while pos < end:
+        year_start = pos.astype('datetime64[Y]')
+        table = get_calendar_table(int(year_start.astype(np.int64)) + 1970)
+        offset = int((pos - year_start.astype('datetime64[h]')).astype(np.int64))
+        take = min(int((end - pos).astype(np.int64)), len(table['boost']) - offset)
+        segments.append((table, slice(offset, offset + take)))
+        pos = pos + take
+    
+    if not segments:
+        no_hours = np.array([], dtype='datetime64[h]')
+        festivals = festival_columns(no_hours, lookup=calendar_festival_info)
+        return build_feature_matrix(no_hours, festivals), festivals
+    
+    keys = ('features', 'is_festival', 'festival_id', 'boost')
+    if len(segments) == 1:
+        table, rows = segments[0]
+        window = {k: table[k][rows] for k in keys}
+    else:
+        window = {k: np.concatenate([table[k][rows] for table, rows in segments]) for k in keys}
+    
+    features = window.pop('features')
+    return features, window
+
+def window_years(start: datetime, hours: int) -> range:
+    """Calendar years touched by `hours` consecutive hours from `start`"""
+    return range(start.year, (start + timedelta(hours=max(hours, 1) - 1)).year + 1)
+
+def calendar_versions(start: np.datetime64, end: np.datetime64) -> Dict[int, tuple]:
+    """festival_calendar_version() of every year touched by the hours [start, end)"""
+    first, last = (int(h.astype('datetime64[Y]').astype(np.int64)) + 1970 for h in (start, end - 1))
+    return {year: festival_calendar_version(year) for year in range(first, last + 1)}
+
+# ============================================================================
+# ROLLING FORECAST STORE
+# ============================================================================
+
+# Predictions depend only on the hour, the model and the festival calendar, so a
+# background task keeps raw model output for the next FORECAST_HORIZON_DAYS for
+# every loaded model. Requests inside that window are served by index arithmetic.
+FORECAST_HORIZON_DAYS = int(os.environ.get('FORECAST_HORIZON_DAYS', '90'))  # 0 disables the store
+FORECAST_REFRESH_INTERVAL = int(os.environ.get('FORECAST_REFRESH_INTERVAL', '300'))  # seconds
+FORECAST_STORE = {}  # model_name -> {'start', 'predictions', 'is_festival', 'festival_id', 'boost', 'model', ...}
+
+FORECAST_STORE_HOURS = Gauge(
+    'forecast_store_hours', 'Hours covered by the rolling forecast store', ['model']
+)
+FORECAST_STORE_LOOKUPS_TOTAL = Counter(
+    'forecast_store_lookups_total', 'Rolling forecast store lookups', ['model', 'result']
+)
+
+def forecast_store_range() -> tuple:
+    """Hours the store should cover: from yesterday's midnight (local wall clock, so
+    clients a few timezones behind are still inside) to FORECAST_HORIZON_DAYS ahead"""
+    start = np.datetime64(datetime.now().date(), 'D').astype('datetime64[h]') - 24
+    return start, start + (FORECAST_HORIZON_DAYS + 2) * 24
+
+def compute_forecast_rows(model_name: str, start: np.datetime64, hours: int) -> Dict[str, Any]:
+    """Run a model over consecutive hours and return its raw output with festival columns"""
+    feature_matrix, festivals = calendar_window(start.astype(datetime), hours)
+    predictions, model_used = run_inference(model_name, feature_matrix)
+    rows = {'predictions': predictions, 'model': model_used}
+    rows.update(festivals)
+    return rows
+
+def recompute_changed_years(model_name: str, entry: Dict[str, Any]):
+    """Recompute the rows of the years whose calendar changed since `entry` was built;
+    rows of other years are kept. Returns the updated entry, or None if the model's
+    output changed (fell back or recovered) and everything must be recomputed."""
+    changed = [year for year, version in entry['calendar_versions'].items() if version != festival_calendar_version(year)]
+    if not changed:
+        return entry
+    columns = ('predictions', 'is_festival', 'festival_id', 'boost')
+    updated = dict(entry, calendar_versions=dict(entry['calendar_versions']))
+    for k in columns:
+        updated[k] = entry[k].copy()
+    for year in changed:
+        updated['calendar_versions'][year] = festival_calendar_version(year)
+        year_start = max(entry['start'], np.datetime64(str(year), 'Y').astype('datetime64[h]'))
+        year_end = min(entry['end'], np.datetime64(str(year + 1), 'Y').astype('datetime64[h]'))
+        rows = compute_forecast_rows(model_name, year_start, int((year_end - year_start).astype(np.int64)))
+        if rows['model'] != entry['model']:
+            return None
+        offset = int((year_start - entry['start']).astype(np.int64))
+        for k in columns:
+            updated[k][offset:offset + len(rows[k])] = rows[k]
+    return updated
+
+def refresh_forecast_store(model_name: str):
+    """Extend (or rebuild) one model's forecast so it covers forecast_store_range().
+    
+    Only hours that are new since the last refresh, or whose year's calendar changed,
+    are computed; the whole array is rebuilt after a model change. The entry is
+    swapped in atomically.
+    """
+    start, end = forecast_store_range()
+    entry = FORECAST_STORE.get(model_name)
+    columns = ('predictions', 'is_festival', 'festival_id', 'boost')
+    load_calendar_years(window_years(start.astype(datetime), int((end - start).astype(np.int64))))
+    
+    reusable = (
+        entry is not None
+        and entry['model_ref'] is MODELS.get(model_name)
+        and entry['start'] <= start < entry['end']
+    )
+    if reusable:
+        entry = recompute_changed_years(model_name, entry)
+        reusable = entry is not None
+    if reusable and entry['end'] >= end:
+        if entry is FORECAST_STORE.get(model_name) and entry['start'] == start:
+            return
+        offset = int((start - entry['start']).astype(np.int64))
+        rows = {k: entry[k][offset:] for k in columns}
+        rows['model'] = entry['model']
+        end = entry['end']
+        versions = entry['calendar_versions']
+    elif reusable:
+        offset = int((start - entry['start']).astype(np.int64))
+        versions = dict(entry['calendar_versions'], **calendar_versions(entry['end'], end))
+        tail = compute_forecast_rows(model_name, entry['end'], int((end - entry['end']).astype(np.int64)))
+        if tail['model'] != entry['model']:
+            # Model fell back (or recovered) since the last refresh - recompute everything
+            versions = calendar_versions(start, end)
+            rows = compute_forecast_rows(model_name, start, int((end - start).astype(np.int64)))
+        else:
+            rows = {k: np.concatenate([entry[k][offset:], tail[k]]) for k in columns}
+            rows['model'] = tail['model']
+    else:
+        versions = calendar_versions(start, end)
+        rows = compute_forecast_rows(model_name, start, int((end - start).astype(np.int64)))
+    
+    rows.update({
+        'start': start,
+        'end': end,
+        # Calendar version each covered year's rows were computed with
+        'calendar_versions': {year: versions[year] for year in calendar_versions(start, end)},
+        'model_ref': MODELS.get(model_name),
+    })
+    FORECAST_STORE[model_name] = rows
+    FORECAST_STORE_HOURS.labels(model=model_name).set(len(rows['predictions']))
+
+def refresh_all_forecasts():
+    """Refresh the forecast store for every loaded model"""
+    for model_name in list(MODEL_RUNNERS):
+        try:
+            refresh_forecast_store(model_name)
+        except Exception as e:
+            logger.warning(f"Forecast store refresh failed for {model_name}: {e}")
+
+def forecast_slice(model_name: str, start: datetime, hours: int):
+    """Stored raw predictions and festival columns for a window, or None if it isn't fully covered"""
+    entry = FORECAST_STORE.get(model_name)
+    if entry is None or entry['model_ref'] is not MODELS.get(model_name):
+        FORECAST_STORE_LOOKUPS_TOTAL.labels(model=model_name, result='miss').inc()
+        return None
+    offset = int((to_hour64(start) - entry['start']).astype(np.int64))
+    if (
+        offset < 0
+        or offset + hours > len(entry['predictions'])
+        # Only the calendar of the years this window touches matters
+        or any(entry['calendar_versions'][year] != festival_calendar_version(year) for year in window_years(start, hours))
+    ):
+        FORECAST_STORE_LOOKUPS_TOTAL.labels(model=model_name, result='miss').inc()
+        return None
+    FORECAST_STORE_LOOKUPS_TOTAL.labels(model=model_name, result='hit').inc()
+    rows = slice(offset, offset + hours)
+    window = {k: entry[k][rows] for k in ('predictions', 'is_festival', 'festival_id', 'boost')}
+    window['model'] = entry['model']
+    return window
+
+async def forecast_store_loop():
+    """Background task keeping the forecast store current"""
+    while True:
+        await run_blocking(refresh_all_forecasts)
+        await asyncio.sleep(FORECAST_REFRESH_INTERVAL)
+
+# ============================================================================
+# PREDICTION FUNCTION
+# ============================================================================
+
+def format_batch_predictions(timestamps: List[datetime], predictions_raw, festivals: Dict[str, np.ndarray], model_name: str, with_reasoning: bool = True) -> List[Dict[str, Any]]:
+    """Turn raw batch model output into prediction results (clamped, festival-boosted, cached).
+    
+    Reasoning is queued for the background workers; without it, /predict queues
+    it when serving the cached results.
+    """
+    boosts = festivals['boost']
+    loads = np.maximum(np.asarray(predictions_raw, dtype=np.float64), 50.0)
+    loads = np.where(boosts > 1.0, loads * boosts, loads)
+    cached_time = time.time()
+    
+    results = []
+    for i, ts in enumerate(timestamps):
+        result = {
+            'timestamp': ts.isoformat(),
+            'hour': ts.hour,
+            'predicted_load': float(loads[i]),
+            'is_festival': int(festivals['is_festival'][i]),
+            'festival_name': FESTIVAL_NAMES[festivals['festival_id'][i]],
+            'boost': float(boosts[i]),
+            'model': model_name,  # Use actual model used (may be CatBoost fallback)
+            'reasoning': '',  # Filled in by the reasoning workers
+            'reasoning_status': 'none',
+            'id': prediction_id(get_cache_key(ts, model_name))
+        }
+        
+        # Generate AI reasoning using Gemini in the background
+        if with_reasoning:
+            queue_reasoning(result)
+        
+        results.append(result)
+    
+    # Cache the results
+    cache_put_many(timestamps, model_name, results, cached_time)
+    return results
+
+def compute_window_predictions(model_name: str, start_time: datetime, hours: int, indices: List[int], timestamps: List[datetime]) -> List[Dict[str, Any]]:
+    """Compute (and cache) predictions for the given hour offsets of a /predict window.
+    
+    Blocking - runs off the event loop. Returns results aligned with `indices`.
+    """
+    forecast = forecast_slice(model_name, start_time, hours)
+    if forecast is not None:
+        # Inside the rolling forecast window: index into precomputed output, no model call
+        predictions_raw = forecast['predictions'][indices]
+        festivals = {k: forecast[k][indices] for k in ('is_festival', 'festival_id', 'boost')}
+        model_name = forecast['model']
+    else:
+        # Slice the feature matrix for the window from the calendar table;
+        # only the requested rows are kept (no copy when that is all of them)
+        feature_matrix, festivals = calendar_window(start_time, hours)
+        if len(indices) < hours:
+            feature_matrix = feature_matrix[indices]
+            festivals = {k: v[indices] for k, v in festivals.items()}
+        
+        try:
+            # Batch predict (much faster than individual predictions), merged with
+            # other small concurrent windows; the engine falls back to CatBoost on
+            # the same feature matrix if the model fails
+            predictions_raw, model_name = batched_inference(model_name, feature_matrix)
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+    
+    return format_batch_predictions(timestamps, predictions_raw, festivals, model_name)
+
+# ============================================================================
+# REQUEST COALESCING
+# ============================================================================
+
+# Single-flight registry: (model_name, wall-clock hour) -> Future of the computation
+# that owns that hour. Concurrent /predict calls for overlapping uncached hours
+# wait on the owner instead of building features and running the model again.
+PREDICTION_FLIGHTS = {}
+_PREDICTION_FLIGHTS_LOCK = threading.Lock()
+
+PREDICTION_CALLS_COALESCED_TOTAL = Counter(
+    'prediction_calls_coalesced_total', 'Prediction calls that waited on an in-flight computation', ['model']
+)
+PREDICTION_HOURS_COALESCED_TOTAL = Counter(
+    'prediction_hours_coalesced_total', 'Predicted hours shared from an in-flight computation', ['model']
+)
+
+async def coalesced_window_predictions(model_name: str, start_time: datetime, hours: int, indices: List[int], timestamps: List[datetime]) -> List[Dict[str, Any]]:
+    """compute_window_predictions() with single-flight coalescing per (model, hour).
+    
+    Hours nobody is computing are claimed and computed by this call; hours already
+    in flight are awaited. Returns results aligned with `indices`.
+    """
+    base_hour = int(to_hour64(start_time).astype(np.int64))
+    owned = []
+    waiting = {}  # in-flight Future -> positions (in indices) it will provide
+    with _PREDICTION_FLIGHTS_LOCK:
+        for pos, i in enumerate(indices):
+            flight = PREDICTION_FLIGHTS.get((model_name, base_hour + i))
+            if flight is None:
+                owned.append(pos)
+            else:
+                waiting.setdefault(flight, []).append(pos)
+        if owned:
+            my_flight = concurrent.futures.Future()
+            for pos in owned:
+                PREDICTION_FLIGHTS[(model_name, base_hour + indices[pos])] = my_flight
+    
+    if waiting:
+        PREDICTION_CALLS_COALESCED_TOTAL.labels(model=model_name).inc()
+        PREDICTION_HOURS_COALESCED_TOTAL.labels(model=model_name).inc(len(indices) - len(owned))
+    
+    results = [None] * len(indices)
+    if owned:
+        try:
+            computed = await run_blocking(
+                compute_window_predictions, model_name, start_time, hours,
+                [indices[pos] for pos in owned], [timestamps[pos] for pos in owned]
+            )
+            my_flight.set_result({base_hour + indices[pos]: result for pos, result in zip(owned, computed)})
+        except BaseException as e:
+            my_flight.set_exception(e)
+            raise
+        finally:
+            with _PREDICTION_FLIGHTS_LOCK:
+                for pos in owned:
+                    key = (model_name, base_hour + indices[pos])
+                    if PREDICTION_FLIGHTS.get(key) is my_flight:
+                        del PREDICTION_FLIGHTS[key]
+        for pos, result in zip(owned, computed):
+            results[pos] = result
+    
+    for flight, positions in waiting.items():
+        shared = await asyncio.wrap_future(flight)
+        for pos in positions:
+            results[pos] = shared[base_hour + indices[pos]]
+    return results
+
+# ============================================================================
+# CONDITIONAL GET
+# ============================================================================
+
+# Read endpoints polled by the admin UI get strong ETags built from everything
+# their body depends on (model versions, calendar fingerprint, query parameters),
+# so If-None-Match is answered with 304 before any work is done, plus
+# Cache-Control so an ingress cache can absorb the polling.
+READ_CACHE_MAX_AGE = int(os.environ.get('READ_CACHE_MAX_AGE', '60'))  # seconds
+
+CONDITIONAL_RESPONSES_TOTAL = Counter(
+    'conditional_responses_total', 'Responses of ETag-enabled routes (not_modified = 304)', ['route', 'result']
+)
+
+def read_etag(*parts) -> str:
+    """Strong ETag from the values a response body depends on"""
+    return '"' + hashlib.sha256(repr(parts).encode()).hexdigest()[:32] + '"'
+
+def reasoning_state(predictions: List[Dict[str, Any]]) -> tuple:
+    """Reasoning status of the predictions in a response body (an ETag part: changes
+    when one of them gets its reasoning, not when the workers finish unrelated ones)"""
+    return tuple((p.get('id'), p.get('reasoning_status')) for p in predictions)
+
+def cache_headers(etag: str, max_age: int = None) -> Dict[str, str]:
+    """ETag and Cache-Control headers for a read endpoint"""
+    max_age = READ_CACHE_MAX_AGE if max_age is None else max_age
+    return {'ETag': etag, 'Cache-Control': f"public, max-age={max(int(max_age), 0)}"}
+
+def not_modified(request: Request, route: str, etag: str, max_age: int = None) -> Response | None:
+    """A 304 response if the client's If-None-Match already names this ETag, else None"""
+    header = request.headers.get('if-none-match')
+    if header:
+        tags = [tag.strip() for tag in header.split(',')]
+        if '*' in tags or any(tag.removeprefix('W/') == etag for tag in tags):
+            CONDITIONAL_RESPONSES_TOTAL.labels(route=route, result='not_modified').inc()
+            return Response(status_code=304, headers=cache_headers(etag, max_age))
+    return None
+
+def set_cache_headers(response: Response, route: str, etag: str, max_age: int = None):
+    """Attach ETag and Cache-Control to a full (200) response"""
+    CONDITIONAL_RESPONSES_TOTAL.labels(route=route, result='full').inc()
+    response.headers.update(cache_headers(etag, max_age))
+
+def seconds_until_midnight() -> int:
+    """Seconds until the next local midnight"""
+    now = datetime.now()
+    return int((datetime.combine(now.date() + timedelta(days=1), datetime.min.time()) - now).total_seconds())
+
+# ============================================================================
+# PYDANTIC MODELS
 # ============================================================================
 
 class PredictionRequest(BaseModel):
@@ -984,6 +2543,34 @@ class PredictionResponse(BaseModel):
     festival_name: str
     model: str
     reasoning: str = ""  # AI-generated reasoning for the prediction
+    reasoning_status: str = "none"  # pending | ready | none
+    id: str = ""  # Prediction id for GET /api/predict/reasoning
+
+# Field order and defaults of PredictionResponse, so the fast path below writes
+# the same JSON FastAPI would produce through response_model
+PREDICTION_RESPONSE_FIELDS = tuple((name, field.default) for name, field in PredictionResponse.model_fields.items())
+
+def prediction_payload(result: Dict[str, Any]) -> Dict[str, Any]:
+    """The PredictionResponse fields of an internal prediction result"""
+    return {name: result.get(name, default) for name, default in PREDICTION_RESPONSE_FIELDS}
+
+def render_predictions(results: List[Dict[str, Any]]) -> bytes:
+    """Serialize prediction results straight to JSON bytes.
+    
+    Results are built by this module with the right types already, so the
+    per-item Pydantic validation of response_model is skipped.
+    """
+    return orjson.dumps([prediction_payload(result) for result in results])
+
+def json_response(payload: Any) -> Response:
+    """JSON response encoded with orjson (bypasses FastAPI's jsonable_encoder)"""
+    return Response(content=orjson.dumps(payload), media_type='application/json')
+
+class EnsembleRequest(BaseModel):
+    start_time: str  # ISO format datetime
+    hours: int = 24
+    models: List[str] | None = None  # Default: every loaded model
+    weights: Dict[str, float] | None = None  # Blend weights per model. Default: equal
 
 class ScalingRequest(BaseModel):
     predicted_load: float
@@ -999,6 +2586,106 @@ class StatusCheck(BaseModel):
 class StatusCheckCreate(BaseModel):
     client_name: str
 
+# ============================================================================
+# RESPONSE ENCODING
+# ============================================================================
+
+# /predict?format=columnar sends one object of columns instead of a row per hour:
+# timestamps and hours follow from 'start' + 'step_seconds', loads are a plain
+# float array and the repetitive string/int fields are run-length encoded as
+# {'values': [...], 'lengths': [...]}. Large bodies are compressed with brotli or
+# gzip when the client accepts it.
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.environ.get('RESPONSE_COMPRESSION_MIN_BYTES', '4096'))
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+    logger.info("ℹ️ brotli not installed, /predict responses are compressed with gzip only")
+
+RESPONSE_ENCODED_BYTES_TOTAL = Counter(
+    'response_encoded_bytes_total', 'Bytes of /predict responses before and after compression', ['format', 'encoding', 'stage']
+)
+
+def run_length_encode(values: list) -> Dict[str, list]:
+    """Runs of equal values as {'values': [...], 'lengths': [...]}"""
+    run_values, lengths = [], []
+    for value in values:
+        if run_values and run_values[-1] == value:
+            lengths[-1] += 1
+        else:
+            run_values.append(value)
+            lengths.append(1)
+    return {'values': run_values, 'lengths': lengths}
+
+def columnar_predictions(results: List[Dict[str, Any]], start_time: datetime) -> Dict[str, Any]:
+    """Columnar form of consecutive hourly prediction results (see RESPONSE ENCODING)"""
+    payload = {
+        'format': 'columnar',
+        'count': len(results),
+        'start': start_time.isoformat(),
+        'step_seconds': 3600,
+    }
+    for name, default in PREDICTION_RESPONSE_FIELDS:
+        if name in ('timestamp', 'hour'):
+            continue  # Derived from start + step
+        column = [result.get(name, default) for result in results]
+        if name == 'predicted_load':
+            payload[name] = column
+        elif name == 'id':
+            # Ids are 'model:version:hour' over consecutive hours: the prefix
+            # runs plus the first hour give every id back
+            parts = [value.rsplit(':', 1) for value in column]
+            payload[name] = {
+                'prefix': run_length_encode([prefix for prefix, _ in parts]),
+                'hour_start': int(parts[0][1]) if parts else None,
+            }
+        else:
+            payload[name] = run_length_encode(column)
+    return payload
+
+def accepted_encodings(header: str) -> set:
+    """Content codings the client accepts (Accept-Encoding without q=0 entries)"""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """brotli or gzip compression tuned for speed over ratio (blocking)"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=4)
+    return gzip.compress(body, compresslevel=5)
+
+async def encoded_response(request: Request, body: bytes, response_format: str) -> Response:
+    """JSON response, compressed when it is above RESPONSE_COMPRESSION_MIN_BYTES
+    and the client accepts brotli (preferred) or gzip"""
+    headers = {'Vary': 'Accept-Encoding'}
+    encoding = 'identity'
+    if len(body) >= RESPONSE_COMPRESSION_MIN_BYTES:
+        accepted = accepted_encodings(request.headers.get('accept-encoding', ''))
+        if BROTLI_AVAILABLE and 'br' in accepted:
+            encoding = 'br'
+        elif 'gzip' in accepted or '*' in accepted:
+            encoding = 'gzip'
+    RESPONSE_ENCODED_BYTES_TOTAL.labels(format=response_format, encoding=encoding, stage='raw').inc(len(body))
+    if encoding != 'identity':
+        body = await run_blocking(compress_body, body, encoding)
+        headers['Content-Encoding'] = encoding
+    RESPONSE_ENCODED_BYTES_TOTAL.labels(format=response_format, encoding=encoding, stage='sent').inc(len(body))
+    return Response(content=body, media_type='application/json', headers=headers)
+
 # ============================================================================
 # API ROUTES
 # ============================================================================
@@ -1024,420 +2711,196 @@ async def health_check():
         "aws_region": os.environ.get('AWS_REGION', 'not-set'),
         "gemini_configured": gemini_configured,
         "mongo_configured": mongo_configured,
-        "total_festivals_2025": len([k for k in HARDCODED_FESTIVALS.keys() if k.startswith('2025')])
+        "total_festivals_2025": len(festival_year(2025)),
+        "calendar_tables": calendar_table_stats(),
+        "prediction_cache": prediction_cache_stats(),
+        "disk_cache": disk_cache_stats()
     }
 
+def request_model_name(model_name: str) -> str:
+    """Model to serve a request with - auto-fallback to CatBoost if it has failed too many times"""
+    if model_name != 'catboost' and model_name in MODEL_FAILURE_COUNT:
+        if MODEL_FAILURE_COUNT[model_name] >= MAX_FAILURES:
+            logger.info(f"Model {model_name} has failed {MODEL_FAILURE_COUNT[model_name]} times, using CatBoost")
+            return 'catboost'
+    return model_name
+
 @api_router.post("/predict", response_model=List[PredictionResponse])
-async def predict_endpoint(request: PredictionRequest):
-    """Predict traffic for next N hours - optimized with batch processing and smart caching"""
-    start_time = parse_iso_datetime(request.start_time)
+async def predict_endpoint(request: PredictionRequest, http_request: Request, format: str = 'rows'):
+    """Predict traffic for next N hours - optimized with batch processing and smart caching
     
+    format=columnar returns a single object of columns instead of a row per hour
+    (see columnar_predictions). Large responses are brotli/gzip compressed when accepted.
+    """
+    if format not in ('rows', 'columnar'):
+        raise HTTPException(status_code=400, detail="format must be 'rows' or 'columnar'")
+    start_time = parse_iso_datetime(request.start_time)
+    predictions = await predict_window(request_model_name(request.model_name), start_time, request.hours)
+    # response_model documents the (rows) schema; the body is rendered directly
+    if format == 'columnar':
+        body = orjson.dumps(columnar_predictions(predictions, start_time))
+    else:
+        body = render_predictions(predictions)
+    return await encoded_response(http_request, body, format)
+
+async def predict_window(actual_model_name: str, start_time: datetime, hours: int) -> List[Dict[str, Any]]:
+    """Predictions for `hours` consecutive hours from start_time, served from the
+    cache tiers where possible"""
     # Batch prepare all timestamps first
-    all_timestamps = [start_time + timedelta(hours=i) for i in range(request.hours)]
+    all_timestamps = [start_time + timedelta(hours=i) for i in range(hours)]
     
-    # Check if model has failed too many times - auto-fallback to CatBoost
-    actual_model_name = request.model_name
-    if request.model_name != 'catboost' and request.model_name in MODEL_FAILURE_COUNT:
-        if MODEL_FAILURE_COUNT[request.model_name] >= MAX_FAILURES:
-            logger.info(f"Model {request.model_name} has failed {MODEL_FAILURE_COUNT[request.model_name]} times, using CatBoost")
-            actual_model_name = 'catboost'
+    # Load the Calendarific years this window needs first: they are part of the cache keys
+    if calendar_years_pending(window_years(start_time, hours)):
+        await run_blocking(load_calendar_years, window_years(start_time, hours))
     
     # Check cache first for all timestamps - much faster (optimized)
-    clear_old_cache()  # Only cleans if needed (every 5 min)
     cached_predictions = {}
-    uncached_timestamps = []
-    current_time = datetime.now(timezone.utc).timestamp()
+    uncached_indices = []
     
-    for ts in all_timestamps:
-        cache_key = get_cache_key(ts, actual_model_name)
-        if cache_key in PREDICTION_CACHE:
-            cached_result, cached_time = PREDICTION_CACHE[cache_key]
-            # Quick TTL check (avoid full cleanup on every request)
-            if current_time - cached_time < CACHE_TTL:
-                cached_predictions[ts] = cached_result
-            else:
-                # Expired, remove and add to uncached
-                del PREDICTION_CACHE[cache_key]
-                uncached_timestamps.append(ts)
+    cached_results = await run_blocking(cache_get_many, all_timestamps, actual_model_name)
+    for i, (ts, cached_result) in enumerate(zip(all_timestamps, cached_results)):
+        if cached_result is not None:
+            cached_predictions[ts] = cached_result
         else:
-            uncached_timestamps.append(ts)
+            uncached_indices.append(i)
     
     # If all cached, return immediately (instant response!)
-    if len(cached_predictions) == len(all_timestamps):
+    if not uncached_indices:
         return [cached_predictions[ts] for ts in all_timestamps]
     
-    # Batch prepare festival info only for uncached timestamps
-    festival_info_cache = {}
-    for ts in uncached_timestamps:
-        date_str = ts.strftime('%Y-%m-%d')
-        if date_str not in festival_info_cache:
-            festival_info_cache[date_str] = check_festival_calendarific(date_str)
+    # Compute uncached hours off the event loop, sharing work with identical
+    # concurrent requests
+    uncached_timestamps = [all_timestamps[i] for i in uncached_indices]
+    computed = await coalesced_window_predictions(actual_model_name, start_time, hours, uncached_indices, uncached_timestamps)
+    new_predictions = dict(zip(uncached_timestamps, computed))
     
-    try:
-        # Batch predict only if we have uncached timestamps
-        if not uncached_timestamps:
-            # All cached, return cached results
-            return [cached_predictions[ts] for ts in all_timestamps]
-        
-        # Prepare features in batch - much faster
-        features_dicts = []
-        for ts in uncached_timestamps:
-            date_str = ts.strftime('%Y-%m-%d')
-            hour = ts.hour
-            day_of_week = ts.weekday()
-            month = ts.month
-            festival_info = festival_info_cache[date_str]
-            
-            # Fast feature calculation
-            features_dicts.append({
-                'hour': hour,
-                'day_of_week': day_of_week,
-                'month': month,
-                'day': ts.day,
-                'year': ts.year,
-                'week_of_year': ts.isocalendar()[1],
-                'quarter': (month - 1) // 3 + 1,
-                'day_of_year': ts.timetuple().tm_yday,
-                'hour_sin': np.sin(2 * np.pi * hour / 24),
-                'hour_cos': np.cos(2 * np.pi * hour / 24),
-                'dow_sin': np.sin(2 * np.pi * day_of_week / 7),
-                'dow_cos': np.cos(2 * np.pi * day_of_week / 7),
-                'is_weekend': int(day_of_week >= 5),
-                'is_business_hours': int(9 <= hour <= 18),
-                'is_peak_hours': int(hour in (12, 13, 19, 20, 21)),
-                'is_night': int(hour < 6 or hour > 22),
-                'is_festival': festival_info.get('is_festival', 0),
-                'is_campaign': 0,
-                'festival_name': festival_info.get('festival_name', 'None'),
-                'traffic_lag_1h': 1200.0,
-                'traffic_lag_24h': 1500.0,
-                'traffic_lag_168h': 1400.0,
-                'traffic_rolling_mean_24h': 1300.0,
-                'traffic_rolling_std_24h': 200.0,
-                'traffic_rolling_max_24h': 2000.0,
-                'cpu_usage': 45.0,
-                'memory_usage': 60.0,
-                'response_time': 150.0,
-                'error_rate': 0.5
-            })
-        
-        # Create DataFrame from list of dicts in one go (much faster)
-        all_features = pd.DataFrame(features_dicts)
-        all_features = all_features[FEATURE_COLUMNS]
-        
-        # Batch predict (much faster than individual predictions)
-        model = MODELS[actual_model_name]
-        predictions_raw = []
-        
-        if actual_model_name == 'catboost':
-            # Batch predict all at once
-            predictions_raw = model.predict(all_features)
-        elif actual_model_name == 'lightgbm':
-            # LightGBM batch processing - handle categorical features properly
-            try:
-                # Convert all categorical/object columns to numeric FIRST
-                all_features_lgbm = all_features.copy()
-                if 'festival_name' in all_features_lgbm.columns:
-                    # Fast map using replace (faster than map)
-                    festival_map = {
-                        'None': 0, 'Diwali': 1, 'Holi': 2, 'Christmas': 3,
-                        'Independence Day': 4, 'Republic Day': 5, 'Ram Navami': 6, 'Diwali Weekend': 7
-                    }
-                    all_features_lgbm['festival_name'] = all_features_lgbm['festival_name'].replace(festival_map).fillna(0).astype(int)
-                
-                # Ensure all columns are numeric
-                for col in all_features_lgbm.columns:
-                    if pd.api.types.is_categorical_dtype(all_features_lgbm[col]):
-                        all_features_lgbm[col] = all_features_lgbm[col].astype(int)
-                    elif all_features_lgbm[col].dtype == 'object':
-                        all_features_lgbm[col] = pd.to_numeric(all_features_lgbm[col], errors='coerce').fillna(0)
-                
-                # Predict with LightGBM
-                if hasattr(model, 'best_iteration'):
-                    predictions_raw = model.predict(all_features_lgbm, num_iteration=model.best_iteration)
+    # Combine cached and new predictions in original order
+    # Queue reasoning for cached predictions that have none
+    all_predictions = []
+    for ts in all_timestamps:
+        if ts in cached_predictions:
+            pred = cached_predictions[ts]
+            if not pred.get('reasoning') and pred.get('reasoning_status') != 'pending':
+                queue_reasoning(pred)
+            all_predictions.append(pred)
+        else:
+            all_predictions.append(new_predictions[ts])
+    
+    return all_predictions
+
+@api_router.post("/predict/stream")
+async def predict_stream_endpoint(request: PredictionRequest, format: str = 'ndjson', chunk_hours: int = 24):
+    """Stream predictions for long horizons, computed one chunk (default: a day) at a time.
+    
+    format=ndjson writes one PredictionResponse JSON object per line; format=sse
+    sends one 'predictions' event (a JSON array) per chunk, then an 'end' event.
+    """
+    if format not in ('ndjson', 'sse'):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+    if not MODELS or not FEATURE_COLUMNS:
+        raise HTTPException(status_code=500, detail="Models not loaded")
+    # Validate up front - the status code cannot change once streaming starts
+    start_time = parse_iso_datetime(request.start_time)
+    model_name = request_model_name(request.model_name)
+    if model_name not in MODELS:
+        raise HTTPException(status_code=400, detail=f"Model '{model_name}' not found")
+    chunk_hours = max(chunk_hours, 1)
+    
+    async def generate_chunks():
+        try:
+            for offset in range(0, request.hours, chunk_hours):
+                chunk = await predict_window(model_name, start_time + timedelta(hours=offset), min(chunk_hours, request.hours - offset))
+                if format == 'sse':
+                    yield b"event: predictions\ndata: " + render_predictions(chunk) + b"\n\n"
                 else:
-                    predictions_raw = model.predict(all_features_lgbm)
-                
-                # Reset failure count on success
-                if 'lightgbm' in MODEL_FAILURE_COUNT:
-                    MODEL_FAILURE_COUNT['lightgbm'] = 0
-                logger.info(f"LightGBM batch prediction successful: {len(predictions_raw)} predictions")
-            except Exception as lgbm_error:
-                # Track failure count
-                if 'lightgbm' not in MODEL_FAILURE_COUNT:
-                    MODEL_FAILURE_COUNT['lightgbm'] = 0
-                MODEL_FAILURE_COUNT['lightgbm'] += 1
-                
-                logger.warning(f"LightGBM batch prediction failed: {lgbm_error}, falling back to CatBoost (failure count: {MODEL_FAILURE_COUNT['lightgbm']})")
-                # Fallback to CatBoost for reliability
-                model = MODELS['catboost']
-                predictions_raw = model.predict(all_features)
-                actual_model_name = 'catboost'  # Update for result
-        elif actual_model_name == 'xgboost':
-            try:
-                import xgboost as xgb
-                
-                # Suppress XGBoost warnings during batch prediction
-                with warnings.catch_warnings():
-                    warnings.filterwarnings('ignore', category=UserWarning, module='xgboost')
-                    
-                    all_features_xgb = all_features.copy()
-                    if 'festival_name' in all_features_xgb.columns:
-                        # Use fixed mapping instead of LabelEncoder
-                        all_features_xgb['festival_name'] = all_features_xgb['festival_name'].astype(str).map(
-                            lambda x: encode_festival_name_for_xgboost(x)
-                        ).fillna(0).astype(int)
-                    
-                    # Ensure all columns are numeric
-                    for col in all_features_xgb.columns:
-                        if not pd.api.types.is_numeric_dtype(all_features_xgb[col]):
-                            all_features_xgb[col] = pd.to_numeric(all_features_xgb[col], errors='coerce').fillna(0)
-                    
-                    # Ensure feature order matches training
-                    all_features_xgb = all_features_xgb[FEATURE_COLUMNS]
-                    
-                    # Create DMatrix with feature names
-                    dmatrix = xgb.DMatrix(all_features_xgb, feature_names=FEATURE_COLUMNS)
-                    predictions_raw = model.predict(dmatrix)
-                    
-                    # Ensure all predictions are positive
-                    predictions_raw = np.maximum(predictions_raw, 0.0)
-                    
-                    # Reset failure count on success
-                    if 'xgboost' in MODEL_FAILURE_COUNT:
-                        MODEL_FAILURE_COUNT['xgboost'] = 0
-                    logger.info(f"XGBoost batch prediction successful: {len(predictions_raw)} predictions")
-            except Exception as xgb_error:
-                # Track failure count
-                if 'xgboost' not in MODEL_FAILURE_COUNT:
-                    MODEL_FAILURE_COUNT['xgboost'] = 0
-                MODEL_FAILURE_COUNT['xgboost'] += 1
-                
-                logger.warning(f"XGBoost batch prediction failed: {xgb_error}, falling back to CatBoost (failure count: {MODEL_FAILURE_COUNT['xgboost']})")
-                # Fallback to CatBoost for reliability
-                model = MODELS['catboost']
-                predictions_raw = model.predict(all_features)
-                actual_model_name = 'catboost'  # Update for result
-        elif actual_model_name == 'lstm':
-            try:
-                import tensorflow as tf
-                
-                # LSTM models need numeric features - encode festival_name
-                all_features_lstm = all_features.copy()
-                if 'festival_name' in all_features_lstm.columns:
-                    # Use same encoding as XGBoost for consistency
-                    all_features_lstm['festival_name'] = all_features_lstm['festival_name'].astype(str).map(
-                        lambda x: encode_festival_name_for_xgboost(x)
-                    ).fillna(0).astype(int)
-                
-                # Ensure all columns are numeric
-                for col in all_features_lstm.columns:
-                    if not pd.api.types.is_numeric_dtype(all_features_lstm[col]):
-                        all_features_lstm[col] = pd.to_numeric(all_features_lstm[col], errors='coerce').fillna(0)
-                
-                # Prepare features for LSTM batch prediction in correct order
-                features_array = all_features_lstm[FEATURE_COLUMNS].values.astype(np.float32)
-                
-                # Reshape for LSTM: (batch_size, timesteps, features)
-                # For hourly predictions, each row is a timestep
-                if len(features_array.shape) == 2:
-                    # Reshape to (batch_size, 1, n_features) for LSTM
-                    features_array = features_array.reshape(features_array.shape[0], 1, features_array.shape[1])
-                
-                predictions_raw = model.predict(features_array, verbose=0)
-                
-                # Flatten predictions if needed
-                if len(predictions_raw.shape) > 1:
-                    predictions_raw = predictions_raw.flatten()
-                
-                # Ensure all predictions are positive
-                predictions_raw = np.maximum(predictions_raw.astype(np.float32), 0.0)
-                
-                # Reset failure count on success
-                if 'lstm' in MODEL_FAILURE_COUNT:
-                    MODEL_FAILURE_COUNT['lstm'] = 0
-                logger.info(f"LSTM batch prediction successful: {len(predictions_raw)} predictions")
-            except Exception as lstm_error:
-                # Track failure count
-                if 'lstm' not in MODEL_FAILURE_COUNT:
-                    MODEL_FAILURE_COUNT['lstm'] = 0
-                MODEL_FAILURE_COUNT['lstm'] += 1
-                
-                logger.warning(f"LSTM batch prediction failed: {lstm_error}, falling back to CatBoost (failure count: {MODEL_FAILURE_COUNT['lstm']})")
-                # Fallback to CatBoost for reliability
-                model = MODELS['catboost']
-                predictions_raw = model.predict(all_features)
-                actual_model_name = 'catboost'  # Update for result
-        
-        # Format results for uncached timestamps
-        new_predictions = []
-        for i, ts in enumerate(uncached_timestamps):
-            date_str = ts.strftime('%Y-%m-%d')
-            festival_info = festival_info_cache[date_str]
-            prediction = max(float(predictions_raw[i]), 50.0)
-            
-            # Apply boost
-            boost = festival_info.get('boost', 1.0)
-            if boost > 1.0:
-                prediction = prediction * boost
-            
-            result = {
+                    yield b''.join(orjson.dumps(prediction_payload(prediction)) + b'\n' for prediction in chunk)
+        except HTTPException as e:
+            error = orjson.dumps({'error': e.detail})
+            yield b"event: error\ndata: " + error + b"\n\n" if format == 'sse' else error + b'\n'
+            return
+        if format == 'sse':
+            yield b"event: end\ndata: {}\n\n"
+    
+    media_type = 'text/event-stream' if format == 'sse' else 'application/x-ndjson'
+    return StreamingResponse(generate_chunks(), media_type=media_type, headers={'Cache-Control': 'no-cache'})
+
+@api_router.get("/predict/reasoning")
+async def get_prediction_reasoning(ids: str):
+    """Reasoning for predictions by id (comma-separated ids from /predict)"""
+    prediction_ids = [value for value in ids.split(',') if value]
+    if not prediction_ids:
+        raise HTTPException(status_code=400, detail="No prediction ids given")
+    return {'reasoning': await run_blocking(lookup_reasoning, prediction_ids)}
+
+def ensemble_member_predictions(model_name: str, start_time: datetime, hours: int, feature_matrix: np.ndarray) -> tuple:
+    """Raw predictions of one ensemble member: from the forecast store if it covers the
+    window, otherwise from the shared feature matrix. Returns (predictions, model_used)."""
+    forecast = forecast_slice(model_name, start_time, hours)
+    if forecast is not None:
+        return forecast['predictions'], forecast['model']
+    return run_inference(model_name, feature_matrix)
+
+@api_router.post("/predict/ensemble")
+async def predict_ensemble_endpoint(request: EnsembleRequest):
+    """Predict the next N hours with several models in one pass and blend their loads"""
+    if not MODEL_RUNNERS:
+        raise HTTPException(status_code=500, detail="Models not loaded")
+    
+    model_names = request.models or list(MODEL_RUNNERS)
+    unknown = [name for name in model_names if name not in MODEL_RUNNERS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Model(s) not found: {', '.join(unknown)}")
+    
+    weights = request.weights or {}
+    unknown = [name for name in weights if name not in model_names]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Blend weight(s) for model(s) not in the ensemble: {', '.join(unknown)}")
+    weight_values = np.array([float(weights.get(name, 0.0 if weights else 1.0)) for name in model_names])
+    if (weight_values < 0).any() or weight_values.sum() <= 0:
+        raise HTTPException(status_code=400, detail="Blend weights must be non-negative and not all zero")
+    weight_values = weight_values / weight_values.sum()
+    
+    start_time = parse_iso_datetime(request.start_time)
+    timestamps = [start_time + timedelta(hours=i) for i in range(request.hours)]
+    
+    # Build the feature matrix once and score every model on it concurrently
+    # (tree libraries release the GIL while predicting)
+    feature_matrix, festivals = await run_blocking(calendar_window, start_time, request.hours)
+    try:
+        scored = await asyncio.gather(*(
+            run_blocking(ensemble_member_predictions, name, start_time, request.hours, feature_matrix)
+            for name in model_names
+        ))
+    except Exception as e:
+        logger.error(f"Ensemble prediction error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    # Per-model results also fill the per-model caches used by /predict
+    per_model = {}
+    for name, (predictions_raw, model_used) in zip(model_names, scored):
+        per_model[name] = await run_blocking(
+            format_batch_predictions, timestamps, predictions_raw, festivals, model_used, False
+        )
+    
+    loads = np.array([[result['predicted_load'] for result in per_model[name]] for name in model_names])
+    blended = weight_values @ loads if len(timestamps) else np.array([])
+    
+    return json_response({
+        'models': {name: per_model[name][0]['model'] if timestamps else name for name in model_names},
+        'weights': {name: float(w) for name, w in zip(model_names, weight_values)},
+        'predictions': [
+            {
                 'timestamp': ts.isoformat(),
                 'hour': ts.hour,
-                'predicted_load': prediction,
-                'is_festival': festival_info['is_festival'],
-                'festival_name': festival_info['festival_name'],
-                'boost': boost,
-                'model': actual_model_name,  # Use actual model used (may be CatBoost fallback)
-                'reasoning': ''  # Will be generated below
+                'is_festival': int(festivals['is_festival'][i]),
+                'festival_name': FESTIVAL_NAMES[festivals['festival_id'][i]],
+                'boost': float(festivals['boost'][i]),
+                'loads': {name: float(loads[j, i]) for j, name in enumerate(model_names)},
+                'blended_load': float(blended[i]),
             }
-            
-            # Generate AI reasoning using Gemini (async, non-blocking)
-            try:
-                reasoning = generate_prediction_reasoning(result)
-                result['reasoning'] = reasoning
-            except Exception as e:
-                logger.debug(f"Failed to generate reasoning: {e}")
-                result['reasoning'] = ""
-            
-            # Cache the result
-            cache_key = get_cache_key(ts, actual_model_name)
-            PREDICTION_CACHE[cache_key] = (result, datetime.now(timezone.utc).timestamp())
-            new_predictions.append(result)
-        
-        # Combine cached and new predictions in original order
-        # Add reasoning to cached predictions if missing
-        all_predictions = []
-        for ts in [start_time + timedelta(hours=i) for i in range(request.hours)]:
-            if ts in cached_predictions:
-                pred = cached_predictions[ts]
-                # Add reasoning to cached predictions if missing
-                if not pred.get('reasoning'):
-                    try:
-                        reasoning = generate_prediction_reasoning(pred)
-                        pred['reasoning'] = reasoning
-                    except:
-                        pred['reasoning'] = ""
-                all_predictions.append(pred)
-            else:
-                all_predictions.append(new_predictions[uncached_timestamps.index(ts)])
-        
-        return all_predictions
-        
-    except Exception as e:
-        logger.error(f"Prediction error: {e}")
-        # Try fallback to CatBoost if other model fails
-        if request.model_name != 'catboost' and MODELS and 'catboost' in MODELS:
-            logger.info(f"Attempting fallback to CatBoost model")
-            try:
-                # Re-prepare features for fallback (only uncached timestamps)
-                if not uncached_timestamps:
-                    # If all were cached, return cached results
-                    return [cached_predictions[ts] for ts in all_timestamps]
-                
-                # Prepare features for uncached timestamps
-                fallback_features_dicts = []
-                for ts in uncached_timestamps:
-                    date_str = ts.strftime('%Y-%m-%d')
-                    hour = ts.hour
-                    day_of_week = ts.weekday()
-                    month = ts.month
-                    festival_info = festival_info_cache[date_str]
-                    
-                    fallback_features_dicts.append({
-                        'hour': hour,
-                        'day_of_week': day_of_week,
-                        'month': month,
-                        'day': ts.day,
-                        'year': ts.year,
-                        'week_of_year': ts.isocalendar()[1],
-                        'quarter': (month - 1) // 3 + 1,
-                        'day_of_year': ts.timetuple().tm_yday,
-                        'hour_sin': np.sin(2 * np.pi * hour / 24),
-                        'hour_cos': np.cos(2 * np.pi * hour / 24),
-                        'dow_sin': np.sin(2 * np.pi * day_of_week / 7),
-                        'dow_cos': np.cos(2 * np.pi * day_of_week / 7),
-                        'is_weekend': int(day_of_week >= 5),
-                        'is_business_hours': int(9 <= hour <= 18),
-                        'is_peak_hours': int(hour in (12, 13, 19, 20, 21)),
-                        'is_night': int(hour < 6 or hour > 22),
-                        'is_festival': festival_info.get('is_festival', 0),
-                        'is_campaign': 0,
-                        'festival_name': festival_info.get('festival_name', 'None'),
-                        'traffic_lag_1h': 1200.0,
-                        'traffic_lag_24h': 1500.0,
-                        'traffic_lag_168h': 1400.0,
-                        'traffic_rolling_mean_24h': 1300.0,
-                        'traffic_rolling_std_24h': 200.0,
-                        'traffic_rolling_max_24h': 2000.0,
-                        'cpu_usage': 45.0,
-                        'memory_usage': 60.0,
-                        'response_time': 150.0,
-                        'error_rate': 0.5
-                    })
-                
-                model = MODELS['catboost']
-                all_features = pd.DataFrame(fallback_features_dicts)
-                all_features = all_features[FEATURE_COLUMNS]
-                predictions_raw = model.predict(all_features)
-                
-                # Format results with CatBoost
-                new_predictions = []
-                for i, ts in enumerate(uncached_timestamps):
-                    date_str = ts.strftime('%Y-%m-%d')
-                    festival_info = festival_info_cache[date_str]
-                    prediction = max(float(predictions_raw[i]), 50.0)
-                    
-                    boost = festival_info.get('boost', 1.0)
-                    if boost > 1.0:
-                        prediction = prediction * boost
-                    
-                    result = {
-                        'timestamp': ts.isoformat(),
-                        'hour': ts.hour,
-                        'predicted_load': prediction,
-                        'is_festival': festival_info['is_festival'],
-                        'festival_name': festival_info['festival_name'],
-                        'boost': boost,
-                        'model': 'catboost',  # Note: used fallback
-                        'reasoning': ''  # Will be generated
-                    }
-                    
-                    # Generate AI reasoning
-                    try:
-                        reasoning = generate_prediction_reasoning(result)
-                        result['reasoning'] = reasoning
-                    except Exception as e:
-                        logger.debug(f"Failed to generate reasoning: {e}")
-                        result['reasoning'] = ""
-                    
-                    # Cache the result
-                    cache_key = get_cache_key(ts, 'catboost')
-                    PREDICTION_CACHE[cache_key] = (result, datetime.now(timezone.utc).timestamp())
-                    new_predictions.append(result)
-                
-                # Combine cached and new predictions
-                # Add reasoning to cached predictions if missing
-                all_predictions = []
-                for ts in all_timestamps:
-                    if ts in cached_predictions:
-                        pred = cached_predictions[ts]
-                        # Add reasoning to cached predictions if missing
-                        if not pred.get('reasoning'):
-                            try:
-                                reasoning = generate_prediction_reasoning(pred)
-                                pred['reasoning'] = reasoning
-                            except:
-                                pred['reasoning'] = ""
-                        all_predictions.append(pred)
-                    else:
-                        all_predictions.append(new_predictions[uncached_timestamps.index(ts)])
-                
-                return all_predictions
-            except Exception as fallback_error:
-                logger.error(f"Fallback to CatBoost also failed: {fallback_error}")
-        
-        raise HTTPException(status_code=500, detail=str(e))
+            for i, ts in enumerate(timestamps)
+        ]
+    })
 
 @api_router.post("/scale")
 async def scale_endpoint(request: ScalingRequest):
@@ -1462,7 +2925,7 @@ async def reason_endpoint(request: ReasonRequest):
     explanation built from the provided context.
     """
     gemini_key = os.environ.get('GEMINI_API_KEY', '')
-    gemini_url = os.environ.get('GEMINI_API_URL', GEMINI_API_URL)
+    gemini_url = GEMINI_API_URL
 
     # Build prompt when not provided
     prompt = request.prompt
@@ -1484,7 +2947,7 @@ async def reason_endpoint(request: ReasonRequest):
                 'Content-Type': 'application/json'
             }
             payload = { 'input': prompt }
-            resp = requests.post(f"{gemini_url}?key={gemini_key}", headers=headers, json=payload, timeout=20)
+            resp = await http_request('gemini', 'POST', f"{gemini_url}?key={gemini_key}", deadline=20, headers=headers, json=payload)
             resp.raise_for_status()
             try:
                 body = resp.json()
@@ -1524,90 +2987,143 @@ async def reason_endpoint(request: ReasonRequest):
 ## NOTE: Specific year routes must be declared before the dynamic date route
 
 @api_router.get("/models")
-async def get_models():
+async def get_models(request: Request, response: Response):
     """Get available models"""
+    etag = read_etag('models', list(MODELS or {}), sorted(MODEL_VERSIONS.items()))
+    cached = not_modified(request, '/models', etag)
+    if cached:
+        return cached
+    set_cache_headers(response, '/models', etag)
     return {
         "models": list(MODELS.keys()) if MODELS else [],
         "default": "catboost"
     }
 
+# Materialized /next-festival answers: model -> {'day', 'version', 'model_ref', 'result'}.
+# The answer only changes at local midnight, or when the model or calendar changes;
+# next_festival_loop recomputes it for every model in the background.
+NEXT_FESTIVAL_RESULTS = {}
+NEXT_FESTIVAL_REFRESH_INTERVAL = int(os.environ.get('NEXT_FESTIVAL_REFRESH_INTERVAL', '300'))  # seconds
+
+NEXT_FESTIVAL_LOOKUPS_TOTAL = Counter(
+    'next_festival_lookups_total', 'Next festival lookups', ['model', 'result']
+)
+
 @api_router.get("/next-festival")
-async def get_next_festival(model_name: str = 'catboost'):
+async def get_next_festival(request: Request, response: Response, model_name: str = 'catboost'):
     """Get next upcoming festival with predictions"""
+    model_name = request_model_name(model_name)
+    entry = NEXT_FESTIVAL_RESULTS.get(model_name)
+    if next_festival_current(entry, model_name):
+        NEXT_FESTIVAL_LOOKUPS_TOTAL.labels(model=model_name, result='hit').inc()
+        result = entry['result']
+    else:
+        NEXT_FESTIVAL_LOOKUPS_TOTAL.labels(model=model_name, result='miss').inc()
+        result = await run_blocking(refresh_next_festival, model_name)
+    
+    # The answer changes at midnight; its predictions' reasoning fills in later.
+    # Tagged after the lookup - it may have just loaded a year from Calendarific
+    etag = read_etag(
+        'next-festival', model_name, next_festival_version(model_name), datetime.now().date(),
+        reasoning_state(result.get('predictions', []))
+    )
+    max_age = min(READ_CACHE_MAX_AGE, seconds_until_midnight())
+    cached = not_modified(request, '/next-festival', etag, max_age)
+    if cached:
+        return cached
+    set_cache_headers(response, '/next-festival', etag, max_age)
+    return result
+
+def next_festival_version(model_name: str) -> tuple:
+    """Cache versions the next festival answer depends on: this year's and next year's"""
+    this_year = datetime.now().year
+    return (prediction_cache_version(model_name, this_year), prediction_cache_version(model_name, this_year + 1))
+
+def next_festival_current(entry, model_name: str) -> bool:
+    """Whether a materialized answer is still valid for today's date and the loaded model"""
+    return (
+        entry is not None
+        and entry['day'] == datetime.now().date()
+        and entry['version'] == next_festival_version(model_name)
+        and entry['model_ref'] is MODELS.get(model_name)
+    )
+
+def refresh_next_festival(model_name: str) -> Dict[str, Any]:
+    """Compute (and materialize) the next festival answer for a model (blocking)"""
+    today = datetime.now().date()
+    load_calendar_years((today.year, today.year + 1))
+    version = next_festival_version(model_name)
+    model_ref = MODELS.get(model_name)
+    result, model_used = compute_next_festival(model_name, today)
+    # Don't pin an answer computed by a fallback model
+    if model_used == model_name:
+        NEXT_FESTIVAL_RESULTS[model_name] = {'day': today, 'version': version, 'model_ref': model_ref, 'result': result}
+    return result
+
+def refresh_all_next_festivals():
+    """Recompute the next festival answer for every loaded model whose answer is stale"""
+    for model_name in list(MODEL_RUNNERS):
+        if next_festival_current(NEXT_FESTIVAL_RESULTS.get(model_name), model_name):
+            continue
+        try:
+            refresh_next_festival(model_name)
+        except Exception as e:
+            logger.warning(f"Next festival refresh failed for {model_name}: {e}")
+
+async def next_festival_loop():
+    """Background task keeping the next festival answers current (checked at local
+    midnight and every NEXT_FESTIVAL_REFRESH_INTERVAL seconds)"""
+    while True:
+        await run_blocking(refresh_all_next_festivals)
+        await asyncio.sleep(min(seconds_until_midnight() + 1, NEXT_FESTIVAL_REFRESH_INTERVAL))
+
+def compute_next_festival(model_name: str, today) -> tuple:
+    """Find the next festival after `today` and predict its 24 hours in one batch.
+    
+    Returns (result, model_used).
+    """
     try:
-        today = datetime.now()
-        
         # Look for next festival within next 60 days
-        for days_ahead in range(1, 61):
-            check_date = today + timedelta(days=days_ahead)
-            date_str = check_date.strftime('%Y-%m-%d')
+        next_festival = festival_next_after(today.strftime('%Y-%m-%d'))
+        if next_festival:
+            date_str = next_festival['date']
+            check_date = datetime.strptime(date_str, '%Y-%m-%d')
+            days_ahead = (check_date.date() - today).days
             
-            festival_info = check_festival_calendarific(date_str)
-            
-            if festival_info['is_festival'] == 1:
-                # Found next festival, get 24h predictions
-                predictions = []
-                # Check if model has already failed - switch early to avoid 24 failures
-                actual_model = model_name
-                if model_name != 'catboost' and model_name in MODEL_FAILURE_COUNT:
-                    if MODEL_FAILURE_COUNT[model_name] >= MAX_FAILURES:
-                        logger.info(f"Model {model_name} has failed {MODEL_FAILURE_COUNT[model_name]} times previously, using CatBoost")
-                        actual_model = 'catboost'
-                
-                for hour in range(24):
-                    timestamp = check_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-                    try:
-                        pred = predict_traffic(timestamp, actual_model, use_cache=True)
-                        predictions.append(pred)
-                    except Exception as e:
-                        logger.warning(f"Error predicting hour {hour} with {actual_model}: {e}")
-                        # Final fallback to CatBoost if still failing
-                        if actual_model != 'catboost' and 'catboost' in MODELS:
-                            pred = predict_traffic(timestamp, 'catboost', use_cache=True)
-                            predictions.append(pred)
-                            # Switch to CatBoost for remaining predictions
-                            actual_model = 'catboost'
-                        else:
-                            # If CatBoost also fails, use default estimate
-                            logger.error(f"All models failed, using default estimate")
-                            predictions.append({
-                                'timestamp': timestamp.isoformat(),
-                                'hour': hour,
-                                'predicted_load': 1000.0,
-                                'is_festival': 1,
-                                'festival_name': festival_info['festival_name'],
-                                'boost': festival_info.get('boost', 1.0),
-                                'model': 'fallback'
-                            })
+            if days_ahead <= 60:
+                # Found next festival, get 24h predictions (forecast store or one model call)
+                timestamps = [check_date.replace(hour=hour) for hour in range(24)]
+                try:
+                    predictions = compute_window_predictions(model_name, check_date, 24, list(range(24)), timestamps)
+                    model_used = predictions[0]['model']
+                except Exception as e:
+                    # If CatBoost also fails, use default estimate
+                    logger.error(f"All models failed, using default estimate: {e}")
+                    model_used = 'fallback'
+                    predictions = [{
+                        'timestamp': timestamp.isoformat(),
+                        'hour': timestamp.hour,
+                        'predicted_load': 1000.0,
+                        'is_festival': 1,
+                        'festival_name': next_festival['name'],
+                        'boost': next_festival['boost'],
+                        'model': 'fallback'
+                    } for timestamp in timestamps]
                 
                 # Calculate metrics
                 loads = [p['predicted_load'] for p in predictions]
                 avg_load = sum(loads) / len(loads)
                 peak_load = max(loads)
                 
-                # Recommended instances based on peak load (updated logic)
-                if peak_load < 700:
-                    recommended_instances = 1
-                elif peak_load < 1400:
-                    recommended_instances = 2
-                elif peak_load < 2100:
-                    recommended_instances = 3
-                elif peak_load < 3000:
-                    recommended_instances = 4
-                elif peak_load < 5000:
-                    recommended_instances = 5
-                else:
-                    recommended_instances = 10
-                
                 return {
-                    'festival_name': festival_info['festival_name'],
+                    'festival_name': next_festival['name'],
                     'date': date_str,
                     'days_until': days_ahead,
                     'avg_load': round(avg_load),
                     'peak_load': round(peak_load),
-                    'recommended_instances': recommended_instances,
+                    'recommended_instances': calculate_recommended_instances(peak_load),
                     'predictions': predictions
-                }
+                }, model_used
         
         # No festival found in next 60 days
         return {
@@ -1618,268 +3134,222 @@ async def get_next_festival(model_name: str = 'catboost'):
             'peak_load': 0,
             'recommended_instances': 0,
             'predictions': []
-        }
+        }, model_name
         
     except Exception as e:
         logger.error(f"Next festival error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@api_router.get("/festivals/2025")
-async def get_2025_festivals(model_name: str = 'catboost', include_predictions: bool = False, summary_only: bool = True):
-    """Get all 2025 major festivals with predictions and traffic spikes
+@api_router.get("/festivals")
+async def list_festivals(from_date: str = Query(..., alias='from'), to_date: str = Query(..., alias='to'), country: str = 'IN'):
+    """Festivals between two dates (inclusive, YYYY-MM-DD), in date order"""
+    for value in (from_date, to_date):
+        try:
+            datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid date format: {value}. Expected YYYY-MM-DD")
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    
+    # Load the range's Calendarific years first, so the answer doesn't depend on earlier requests
+    years = range(int(from_date[:4]), int(to_date[:4]) + 1)
+    if calendar_years_pending(years, country):
+        await run_blocking(load_calendar_years, years, country)
+    festivals = festival_range(from_date, to_date, country)
+    return {
+        'from': from_date,
+        'to': to_date,
+        'country': country,
+        'total_festivals': len(festivals),
+        'festivals': festivals
+    }
+
+# Materialized /festivals/{year} results: (year, model, mode) -> {'version', 'summary'}.
+# An entry is reused until the model artifact or the festival calendar changes.
+FESTIVAL_SUMMARIES = {}
+
+FESTIVAL_SUMMARY_LOOKUPS_TOTAL = Counter(
+    'festival_summary_lookups_total', 'Festival year summary lookups', ['mode', 'result']
+)
+
+@api_router.get("/festivals/{year:int}")
+async def get_festivals_for_year(request: Request, response: Response, year: int, model_name: str = 'catboost', include_predictions: bool = False, summary_only: bool = True):
+    """Get all major festivals of a year with predictions and traffic spikes
     
     Args:
         model_name: ML model to use (catboost, lightgbm, xgboost)
-        include_predictions: If True, includes 24-hour predictions (slower). Default: False for faster response.
+        include_predictions: If True, includes 24-hour predictions and previous-year comparison. Default: False.
+        summary_only: If True, only the peak hour (12:00) is predicted. Default: True.
     """
+    full = include_predictions and not summary_only
+    actual_model = request_model_name(model_name)
+    summary = current_festival_summary(year, actual_model, full)
+    if summary is None:
+        summary = await run_blocking(festival_year_summary, year, model_name, full)
+    
+    # Tagged after the lookup - it may have just loaded the years from Calendarific
+    etag = read_etag(
+        'festivals', year, actual_model, full, festival_year_version(year, actual_model),
+        reasoning_state([p for festival in summary['festivals'] for p in festival.get('predictions', [])]) if full else None
+    )
+    cached = not_modified(request, '/festivals/{year}', etag)
+    if cached:
+        return cached
+    set_cache_headers(response, '/festivals/{year}', etag)
+    return summary
+
+def festival_year_version(year: int, model_name: str) -> tuple:
+    """Cache versions a year's festival summary depends on: that year's and the
+    previous year's (full mode compares with it)"""
+    return (prediction_cache_version(model_name, year), prediction_cache_version(model_name, year - 1))
+
+def current_festival_summary(year: int, model_name: str, full: bool) -> Dict[str, Any] | None:
+    """Materialized festival summary for a year if still current (memory only, no I/O)"""
+    mode = 'full' if full else 'summary'
+    entry = FESTIVAL_SUMMARIES.get((year, model_name, mode))
+    if (
+        entry is None
+        or entry['version'] != festival_year_version(year, model_name)
+        or calendar_years_pending((year - 1, year))
+    ):
+        return None
+    FESTIVAL_SUMMARY_LOOKUPS_TOTAL.labels(mode=mode, result='hit').inc()
+    return entry['summary']
+
+def festival_year_summary(year: int, model_name: str, full: bool) -> Dict[str, Any]:
+    """Festival summary for a year, from FESTIVAL_SUMMARIES when still current (blocking)"""
+    model_name = request_model_name(model_name)
+    mode = 'full' if full else 'summary'
+    load_calendar_years((year - 1, year))
+    version = festival_year_version(year, model_name)
+    summary = current_festival_summary(year, model_name, full)
+    if summary is not None:
+        return summary
+    FESTIVAL_SUMMARY_LOOKUPS_TOTAL.labels(mode=mode, result='miss').inc()
+    
     try:
-        festivals_with_predictions = []
-        
-        # Get all 2025 festivals from INDIAN_FESTIVALS
-        for date_str, festival_data in INDIAN_FESTIVALS.items():
-            if date_str.startswith('2025'):
-                festival_name = festival_data['name']
-                boost = festival_data['boost']
-                
-                # Parse date
-                festival_date = datetime.strptime(date_str, '%Y-%m-%d')
-                
-                # Get predictions - only if requested (for performance)
-                predictions = []
-                if include_predictions and not summary_only:
-                    # Get 24-hour predictions for this festival
-                    for hour in range(24):
-                        timestamp = festival_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-                        try:
-                            pred = predict_traffic(timestamp, model_name)
-                            predictions.append(pred)
-                        except Exception as e:
-                            logger.warning(f"Error predicting for {date_str} hour {hour}: {e}")
-                            # Fallback: use CatBoost if other model fails
-                            if model_name != 'catboost':
-                                pred = predict_traffic(timestamp, 'catboost')
-                                predictions.append(pred)
-                else:
-                    # Quick/Summary mode: predict peak hour (12:00) for metrics
-                    peak_timestamp = festival_date.replace(hour=12, minute=0, second=0, microsecond=0)
-                    avg_load, peak_load = get_peak_prediction_with_fallback(peak_timestamp, model_name, boost)
-                
-                # Calculate metrics
-                if include_predictions and predictions:
-                    loads = [p['predicted_load'] for p in predictions]
-                    avg_load = sum(loads) / len(loads)
-                    peak_load = max(loads)
-                    peak_hour = predictions[loads.index(peak_load)]['hour']
-                else:
-                    # Use estimated values from quick mode (already calculated above)
-                    peak_hour = 12
-                
-                # Recommended instances
-                recommended_instances = calculate_recommended_instances(peak_load)
-                
-                # Try to find previous year same festival for comparison (only if predictions requested)
-                previous_year_data = None
-                if include_predictions:
-                    date_prev = date_str.replace('2025', '2024')
-                    if date_prev in INDIAN_FESTIVALS and INDIAN_FESTIVALS[date_prev]['name'] == festival_name:
-                        # Get previous year predictions (as historical data) - just peak hour for speed
-                        prev_date = datetime.strptime(date_prev, '%Y-%m-%d')
-                        prev_peak_timestamp = prev_date.replace(hour=12, minute=0, second=0, microsecond=0)
-                        try:
-                            prev_peak_pred = predict_traffic(prev_peak_timestamp, model_name, use_cache=True)
-                            prev_avg_load = prev_peak_pred['predicted_load'] * 0.85
-                            prev_peak_load = prev_peak_pred['predicted_load'] * 1.15
-                        except Exception as e:
-                            logger.warning(f"Error predicting {date_prev}: {e}")
-                            prev_avg_load = avg_load * 0.9  # Estimate
-                            prev_peak_load = peak_load * 0.9
-                        
-                        previous_year_data = {
-                            'date': date_prev,
-                            'avg_load': round(prev_avg_load),
-                            'peak_load': round(prev_peak_load),
-                            'growth_rate': round(((avg_load - prev_avg_load) / prev_avg_load) * 100, 2) if prev_avg_load > 0 else 0
-                        }
-                
-                festival_data = {
-                    'festival_name': festival_name,
-                    'date': date_str,
-                    'day_of_week': festival_date.strftime('%A'),
-                    'month': festival_date.strftime('%B'),
-                    'boost': boost,
-                    'avg_load': round(avg_load),
-                    'peak_load': round(peak_load),
-                    'peak_hour': peak_hour,
-                    'recommended_instances': recommended_instances,
-                }
-                
-                # Only include predictions and previous_year if requested
-                if include_predictions and not summary_only:
-                    festival_data['previous_year'] = previous_year_data
-                    festival_data['predictions'] = predictions
-                
-                festivals_with_predictions.append(festival_data)
-        
-        # Sort by date
-        festivals_with_predictions.sort(key=lambda x: x['date'])
-        
-        return {
-            'year': 2025,
-            'total_festivals': len(festivals_with_predictions),
-            'festivals': festivals_with_predictions
-        }
-        
+        summary, model_used = compute_festival_year_summary(year, model_name, full)
     except Exception as e:
-        logger.error(f"2025 festivals error: {e}")
+        logger.error(f"{year} festivals error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    # Don't pin a result computed by a fallback model
+    if model_used == model_name:
+        FESTIVAL_SUMMARIES[(year, model_name, mode)] = {'version': version, 'summary': summary}
+    return summary
 
-@api_router.get("/festivals/2026")
-async def get_2026_festivals(model_name: str = 'catboost', include_predictions: bool = False, summary_only: bool = True):
-    """Get all 2026 major festivals with predictions and traffic spikes
+def compute_festival_year_summary(year: int, model_name: str, full: bool) -> tuple:
+    """Build the festival summary for a year with one batched model call.
     
-    Args:
-        model_name: ML model to use (catboost, lightgbm, xgboost)
-        include_predictions: If True, includes 24-hour predictions (slower). Default: False for faster response.
-        summary_only: If True, uses boost multipliers only (NO predictions, fastest). Default: True.
+    Summary mode predicts each festival's peak hour (12:00); full mode predicts all
+    24 hours of every festival plus the peak hour of the same festival a year
+    earlier. Returns (summary, model_used).
     """
-    try:
-        festivals_with_predictions = []
+    festivals = festival_year(year)
+    dates = [datetime.strptime(f['date'], '%Y-%m-%d') for f in festivals]
+    
+    # Previous-year comparison: the same festival on the same date a year earlier
+    previous = []
+    if full:
+        for i, festival in enumerate(festivals):
+            date_prev = f"{year - 1}{festival['date'][4:]}"
+            if date_prev in INDIAN_FESTIVALS and INDIAN_FESTIVALS[date_prev]['name'] == festival['name']:
+                previous.append((i, date_prev))
+    
+    # Every hour needed for the year, gathered into one feature matrix
+    hours_of_day = range(24) if full else (12,)
+    timestamps = [date.replace(hour=hour) for date in dates for hour in hours_of_day]
+    timestamps += [datetime.strptime(date_prev, '%Y-%m-%d').replace(hour=12) for _, date_prev in previous]
+    
+    model_used = model_name
+    loads = None
+    if timestamps:
+        hours = np.array([to_hour64(ts) for ts in timestamps], dtype='datetime64[h]')
+        festival_cols = festival_columns(hours, lookup=calendar_festival_info)
+        try:
+            predictions_raw, model_used = run_inference(model_name, build_feature_matrix(hours, festival_cols))
+            loads = np.maximum(np.asarray(predictions_raw, dtype=np.float64), 50.0)
+            loads = np.where(festival_cols['boost'] > 1.0, loads * festival_cols['boost'], loads)
+        except Exception as e:
+            logger.warning(f"Error predicting {year} festivals with {model_name}: {e}")
+            model_used = 'fallback'
+    
+    per_festival = len(hours_of_day)
+    previous_loads = dict(zip((i for i, _ in previous), loads[len(dates) * per_festival:])) if loads is not None else {}
+    predictions = []
+    if full and loads is not None:
+        rows = slice(0, len(dates) * per_festival)
+        predictions = format_batch_predictions(
+            timestamps[rows], predictions_raw[rows], {k: v[rows] for k, v in festival_cols.items()}, model_used
+        )
+    
+    festivals_with_predictions = []
+    for i, (festival, festival_date) in enumerate(zip(festivals, dates)):
+        boost = festival['boost']
+        day_predictions = predictions[i * 24:(i + 1) * 24]
+        if loads is None:
+            # No model available - rough estimates from the festival boost
+            avg_load, peak_load, peak_hour = 1000.0 * boost, 1000.0 * boost * 1.2, 12
+        elif full:
+            day_loads = loads[i * 24:(i + 1) * 24]
+            avg_load, peak_load = float(day_loads.mean()), float(day_loads.max())
+            peak_hour = int(day_loads.argmax())
+        else:
+            avg_load, peak_load, peak_hour = float(loads[i]) * 0.85, float(loads[i]) * 1.15, 12
         
-        # Check if model has failed too many times - auto-fallback to CatBoost
-        actual_model = model_name
-        if model_name != 'catboost' and model_name in MODEL_FAILURE_COUNT:
-            if MODEL_FAILURE_COUNT[model_name] >= MAX_FAILURES:
-                logger.info(f"Model {model_name} has failed {MODEL_FAILURE_COUNT[model_name]} times previously, using CatBoost")
-                actual_model = 'catboost'
+        festival_data = {
+            'festival_name': festival['name'],
+            'date': festival['date'],
+            'day_of_week': festival_date.strftime('%A'),
+            'month': festival_date.strftime('%B'),
+            'boost': boost,
+            'avg_load': round(avg_load),
+            'peak_load': round(peak_load),
+            'peak_hour': peak_hour,
+            'recommended_instances': calculate_recommended_instances(peak_load),
+        }
         
-        # Get all 2026 festivals from INDIAN_FESTIVALS
-        for date_str, festival_data in INDIAN_FESTIVALS.items():
-            if date_str.startswith('2026'):
-                festival_name = festival_data['name']
-                boost = festival_data['boost']
-                
-                # Parse date
-                festival_date = datetime.strptime(date_str, '%Y-%m-%d')
-                
-                # Get predictions - only if requested (for performance)
-                predictions = []
-                if include_predictions and not summary_only:
-                    # Get 24-hour predictions for this festival
-                    for hour in range(24):
-                        timestamp = festival_date.replace(hour=hour, minute=0, second=0, microsecond=0)
-                        try:
-                            pred = predict_traffic(timestamp, actual_model, use_cache=True)
-                            predictions.append(pred)
-                        except Exception as e:
-                            logger.warning(f"Error predicting for {date_str} hour {hour}: {e}")
-                            # Fallback: use CatBoost if other model fails
-                            if actual_model != 'catboost':
-                                pred = predict_traffic(timestamp, 'catboost', use_cache=True)
-                                predictions.append(pred)
-                                # Switch to CatBoost for remaining predictions
-                                actual_model = 'catboost'
-                            else:
-                                # If CatBoost also fails, use default estimate
-                                logger.error(f"All models failed, using default estimate")
-                                predictions.append({
-                                    'timestamp': timestamp.isoformat(),
-                                    'hour': hour,
-                                    'predicted_load': 1000.0 * boost,
-                                    'is_festival': 1,
-                                    'festival_name': festival_name,
-                                    'boost': boost,
-                                    'model': 'fallback'
-                                })
+        if full:
+            previous_year_data = None
+            date_prev = next((d for j, d in previous if j == i), None)
+            if date_prev is not None:
+                if i in previous_loads:
+                    prev_avg_load, prev_peak_load = previous_loads[i] * 0.85, previous_loads[i] * 1.15
                 else:
-                    # Quick/Summary mode: predict peak hour (12:00) for metrics
-                    peak_timestamp = festival_date.replace(hour=12, minute=0, second=0, microsecond=0)
-                    avg_load, peak_load = get_peak_prediction_with_fallback(peak_timestamp, actual_model, boost)
-                
-                # Calculate metrics
-                if include_predictions and predictions:
-                    loads = [p['predicted_load'] for p in predictions]
-                    avg_load = sum(loads) / len(loads)
-                    peak_load = max(loads)
-                    peak_hour = predictions[loads.index(peak_load)]['hour']
-                else:
-                    # Use estimated values from quick mode (already calculated above)
-                    peak_hour = 12
-                
-                # Recommended instances
-                recommended_instances = calculate_recommended_instances(peak_load)
-                
-                # Try to find previous year same festival for comparison (only if predictions requested)
-                previous_year_data = None
-                if include_predictions:
-                    date_prev = date_str.replace('2026', '2025')
-                    if date_prev in INDIAN_FESTIVALS and INDIAN_FESTIVALS[date_prev]['name'] == festival_name:
-                        # Get previous year predictions (as historical data) - just peak hour for speed
-                        prev_date = datetime.strptime(date_prev, '%Y-%m-%d')
-                        prev_peak_timestamp = prev_date.replace(hour=12, minute=0, second=0, microsecond=0)
-                        try:
-                            prev_peak_pred = predict_traffic(prev_peak_timestamp, actual_model, use_cache=True)
-                            prev_avg_load = prev_peak_pred['predicted_load'] * 0.85
-                            prev_peak_load = prev_peak_pred['predicted_load'] * 1.15
-                        except Exception as e:
-                            logger.warning(f"Error predicting {date_prev}: {e}")
-                            prev_avg_load = avg_load * 0.9  # Estimate
-                            prev_peak_load = peak_load * 0.9
-                        
-                        previous_year_data = {
-                            'date': date_prev,
-                            'avg_load': round(prev_avg_load),
-                            'peak_load': round(prev_peak_load),
-                            'growth_rate': round(((avg_load - prev_avg_load) / prev_avg_load) * 100, 2) if prev_avg_load > 0 else 0
-                        }
-                
-                festival_data = {
-                    'festival_name': festival_name,
-                    'date': date_str,
-                    'day_of_week': festival_date.strftime('%A'),
-                    'month': festival_date.strftime('%B'),
-                    'boost': boost,
-                    'avg_load': round(avg_load),
-                    'peak_load': round(peak_load),
-                    'peak_hour': peak_hour,
-                    'recommended_instances': recommended_instances,
+                    prev_avg_load, prev_peak_load = avg_load * 0.9, peak_load * 0.9  # Estimate
+                previous_year_data = {
+                    'date': date_prev,
+                    'avg_load': round(prev_avg_load),
+                    'peak_load': round(prev_peak_load),
+                    'growth_rate': round(((avg_load - prev_avg_load) / prev_avg_load) * 100, 2) if prev_avg_load > 0 else 0
                 }
-                
-                # Only include predictions and previous_year if requested
-                if include_predictions and not summary_only:
-                    festival_data['previous_year'] = previous_year_data
-                    festival_data['predictions'] = predictions
-                
-                festivals_with_predictions.append(festival_data)
-        
-        # Sort by date
-        festivals_with_predictions.sort(key=lambda x: x['date'])
-        
-        return {
-            'year': 2026,
-            'total_festivals': len(festivals_with_predictions),
-            'festivals': festivals_with_predictions
-        }
+            festival_data['previous_year'] = previous_year_data
+            festival_data['predictions'] = day_predictions
         
-    except Exception as e:
-        logger.error(f"2026 festivals error: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        festivals_with_predictions.append(festival_data)
+    
+    return {
+        'year': year,
+        'total_festivals': len(festivals_with_predictions),
+        'festivals': festivals_with_predictions
+    }, model_used
 
 @api_router.get("/festivals/{date}")
-async def check_festival(date: str):
+async def check_festival(request: Request, response: Response, date: str):
     """Check if date is a festival"""
     try:
-        # Validate date format - must be YYYY-MM-DD
-        if len(date) == 4 and date.isdigit():
-            # If only year provided, return error or handle differently
-            raise HTTPException(status_code=400, detail="Date must be in format YYYY-MM-DD, not just year")
-        
-        # Try to parse the date to validate format
+        # Validate date format - must be YYYY-MM-DD (a bare year is routed to
+        # get_festivals_for_year)
         try:
             datetime.strptime(date, '%Y-%m-%d')
         except ValueError:
             raise HTTPException(status_code=400, detail=f"Invalid date format: {date}. Expected YYYY-MM-DD")
         
-        festival_info = check_festival_calendarific(date)
+        cached = not_modified(request, '/festivals/{date}', read_etag('festival', date, festival_calendar_fingerprint(int(date[:4]))))
+        if cached:
+            return cached
+        festival_info = await run_blocking(check_festival_calendarific, date)
+        # Tag after the lookup - it may have just loaded the year from Calendarific
+        set_cache_headers(response, '/festivals/{date}', read_etag('festival', date, festival_calendar_fingerprint(int(date[:4]))))
         return festival_info
     except HTTPException:
         raise
@@ -2057,6 +3527,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def warm_calendar_tables():
+    """Build the calendar feature tables for this year and next so the first requests are slices"""
+    if FEATURE_COLUMNS:
+        current_year = datetime.now().year
+        years = (current_year, current_year + 1)
+        # Off the event loop: loading the years may download them from Calendarific
+        await run_blocking(load_calendar_years, years)
+        for year in years:
+            await run_blocking(get_calendar_table, year)
+
+@app.on_event("startup")
+async def start_disk_cache_tier():
+    """Restore the disk cache in the background and start the write-behind thread"""
+    start_disk_cache()
+
+@app.on_event("startup")
+async def start_outbound_http():
+    """Open the pooled outbound HTTP clients on the server loop"""
+    await start_http_clients()
+
+@app.on_event("startup")
+async def start_reasoning_pipeline():
+    """Start the background Gemini reasoning workers"""
+    start_reasoning_workers()
+
+@app.on_event("startup")
+async def start_executor():
+    """Create the inference executor before anything submits work to it"""
+    start_inference_executor()
+
+@app.on_event("startup")
+async def start_calendarific_prefetch():
+    """Start the background task that downloads Calendarific holidays per year"""
+    if CALENDARIFIC_API_KEY:
+        app.state.calendarific_task = asyncio.create_task(calendarific_refresh_loop())
+
+@app.on_event("startup")
+async def start_forecast_store():
+    """Start the background task that keeps the rolling forecast store current"""
+    if MODEL_RUNNERS and FORECAST_HORIZON_DAYS > 0:
+        app.state.forecast_task = asyncio.create_task(forecast_store_loop())
+
+@app.on_event("startup")
+async def start_next_festival_refresh():
+    """Start the background task that precomputes /next-festival for every model"""
+    if MODEL_RUNNERS:
+        app.state.next_festival_task = asyncio.create_task(next_festival_loop())
+
+@app.on_event("shutdown")
+async def stop_calendarific_prefetch():
+    task = getattr(app.state, 'calendarific_task', None)
+    if task:
+        task.cancel()
+
+@app.on_event("shutdown")
+async def stop_forecast_store():
+    task = getattr(app.state, 'forecast_task', None)
+    if task:
+        task.cancel()
+
+@app.on_event("shutdown")
+async def stop_next_festival_refresh():
+    task = getattr(app.state, 'next_festival_task', None)
+    if task:
+        task.cancel()
+
+@app.on_event("shutdown")
+async def shutdown_executor():
+    stop_inference_executor()
+
+@app.on_event("shutdown")
+async def stop_reasoning_pipeline():
+    stop_reasoning_workers()
+
+@app.on_event("shutdown")
+async def shutdown_http_clients():
+    await close_http_clients()
+
+@app.on_event("shutdown")
+async def flush_disk_cache():
+    await asyncio.get_running_loop().run_in_executor(None, stop_disk_cache)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     if client:
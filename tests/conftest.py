@@ -0,0 +1,49 @@
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+# The API is the single module backend/server.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+
+@pytest.fixture
+def fake_http_server():
+    """Start in-process JSON APIs on free local ports: call with respond(path, body)
+    returning the payload of a request. The returned server has `url`, `status`
+    (sent with every response, 200 unless a test changes it) and `requests`
+    ((method, path, body) received)."""
+    servers = []
+
+    def start(respond):
+        class Handler(BaseHTTPRequestHandler):
+            def handle_request(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                self.server.requests.append((self.command, self.path, body))
+                data = json.dumps(respond(self.path, body)).encode()
+                self.send_response(self.server.status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = handle_request
+
+            def log_message(self, *args):
+                pass
+
+        fake = HTTPServer(('127.0.0.1', 0), Handler)
+        host, port = fake.server_address
+        fake.url, fake.status, fake.requests = f"http://{host}:{port}", 200, []
+        threading.Thread(target=fake.serve_forever, daemon=True).start()
+        servers.append(fake)
+        return fake
+
+    yield start
+    for fake in servers:
+        fake.shutdown()
+        fake.server_close()
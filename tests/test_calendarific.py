@@ -0,0 +1,82 @@
+"""Calendarific years: loaded on demand against an in-process fake API, versioned per year"""
+
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+
+def holidays_response(path, body):
+    """GET /holidays: one holiday per year"""
+    year = parse_qs(urlparse(path).query)['year'][0]
+    return {
+        'meta': {'code': 200},
+        'response': {'holidays': [{'name': 'Test Day', 'date': {'iso': f"{year}-05-05"}}]},
+    }
+
+
+def requested_years(api):
+    """(country, year) of every request the fake API received"""
+    return [
+        (query['country'][0], int(query['year'][0]))
+        for query in (parse_qs(urlparse(path).query) for _, path, _ in api.requests)
+    ]
+
+
+@pytest.fixture
+def calendarific(fake_http_server, monkeypatch):
+    """Fake Calendarific API with empty Calendarific state"""
+    api = fake_http_server(holidays_response)
+    monkeypatch.setattr(server, 'CALENDARIFIC_API_KEY', 'test-key')
+    monkeypatch.setattr(server, 'CALENDARIFIC_BASE_URL', api.url)
+    monkeypatch.setattr(server, 'DISK_CACHE_PATH', '')
+    for name in ('CALENDARIFIC_HOLIDAYS', 'CALENDARIFIC_FETCHED', 'CALENDARIFIC_FAILED', 'FESTIVAL_CACHE',
+                 'FESTIVAL_CALENDAR_YEAR_VERSIONS', 'FESTIVAL_CALENDAR_FINGERPRINTS'):
+        monkeypatch.setattr(server, name, {})
+    monkeypatch.setattr(server, 'FESTIVAL_INDEX', server.FESTIVAL_INDEX)
+    return api
+
+
+def test_year_loads_once_and_only_changes_its_own_version(calendarific):
+    other_year = server.prediction_cache_version('lightgbm', 2025)
+    before = server.prediction_cache_version('lightgbm', 1987)
+
+    info = server.check_festival_calendarific('1987-05-05')
+    assert info['is_festival'] == 1 and info['festival_name'] == 'Test Day'
+    assert server.check_festival_calendarific('1987-06-01')['is_festival'] == 0
+    server.load_calendar_years([1987])
+
+    assert requested_years(calendarific) == [('IN', 1987)]
+    assert server.prediction_cache_version('lightgbm', 1987) != before
+    assert server.prediction_cache_version('lightgbm', 2025) == other_year
+    assert server.festival_calendar_version(1987) != server.festival_calendar_version(2025)
+
+
+def test_failed_download_backs_off_and_changes_nothing(calendarific):
+    calendarific.status = 500
+    before = server.prediction_cache_version('lightgbm', 1987)
+
+    assert server.check_festival_calendarific('1987-05-05')['is_festival'] == 0
+    server.load_calendar_years([1987])
+
+    assert requested_years(calendarific) == [('IN', 1987)]
+    assert server.calendar_years_pending([1987]) == []
+    assert server.prediction_cache_version('lightgbm', 1987) == before
+
+
+def test_year_view_keeps_only_major_festivals(calendarific):
+    major = server.festival_year(2025)
+
+    server.load_calendar_years([2025])
+
+    assert server.festival_year(2025) == major
+    assert {'date': '2025-05-05', 'name': 'Test Day', 'boost': 1.5} in server.festival_range('2025-05-01', '2025-05-31')
+
+
+def test_festival_range_loads_its_years(calendarific):
+    response = TestClient(server.app).get('/api/festivals', params={'from': '1987-01-01', 'to': '1988-12-31'})
+
+    assert requested_years(calendarific) == [('IN', 1987), ('IN', 1988)]
+    assert [f['date'] for f in response.json()['festivals']] == ['1987-05-05', '1988-05-05']
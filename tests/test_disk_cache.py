@@ -0,0 +1,48 @@
+"""Disk cache tier: pruning keeps the SQLite file bounded"""
+
+import server
+
+
+def insert_predictions(connection, keys, start_time=1000.0):
+    connection.executemany(
+        'INSERT INTO cache_entries VALUES (?, ?, ?, ?)',
+        [('prediction', key, b'', start_time + i) for i, key in enumerate(keys)]
+    )
+    connection.commit()
+
+
+def prediction_keys(connection):
+    return [key for (key,) in connection.execute(
+        "SELECT key FROM cache_entries WHERE namespace = 'prediction' ORDER BY cached_time"
+    )]
+
+
+def test_prune_deletes_other_versions_and_enforces_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'DISK_CACHE_PATH', str(tmp_path / 'cache.db'))
+    monkeypatch.setattr(server, 'MODEL_VERSIONS', {'lightgbm': 'abc'})
+    monkeypatch.setattr(server, 'DISK_CACHE_MAX_ENTRIES', 3)
+    version = server.prediction_cache_version('lightgbm', 1970)  # Hours 0-4 are in 1970
+    connection = server.open_disk_cache()
+
+    current = [f'lightgbm:{version}:{hour}' for hour in range(5)]
+    insert_predictions(connection, ['lightgbm:old-version:1', 'not-an-id'] + current)
+    server.prune_disk_cache(connection, now=2000.0)
+
+    # Other versions are gone and only the newest rows within the budget are kept
+    assert prediction_keys(connection) == current[-3:]
+    connection.close()
+
+
+def test_prune_without_ttl_keeps_current_rows_within_budget(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'DISK_CACHE_PATH', str(tmp_path / 'cache.db'))
+    monkeypatch.setattr(server, 'MODEL_VERSIONS', {'lightgbm': 'abc'})
+    monkeypatch.setattr(server, 'DISK_CACHE_TTLS', {'calendarific': 0, 'prediction': 0})
+    version = server.prediction_cache_version('lightgbm', 1970)  # Hours 0-4 are in 1970
+    connection = server.open_disk_cache()
+
+    current = [f'lightgbm:{version}:{hour}' for hour in range(5)]
+    insert_predictions(connection, current)
+    server.prune_disk_cache(connection, now=10 ** 9)
+
+    assert prediction_keys(connection) == current
+    connection.close()
@@ -0,0 +1,66 @@
+"""Batched Gemini reasoning against an in-process fake generateContent API"""
+
+import json
+from collections import OrderedDict
+
+import pytest
+
+import server
+
+
+def generate_content_response(path, body):
+    """generateContent: batch prompts are answered for their first prediction only,
+    single prompts with plain text"""
+    prompt = body['contents'][0]['parts'][0]['text']
+    if 'JSON array' in prompt:
+        text = json.dumps([{'prediction': 1, 'reasoning': 'batch reasoning'}])
+    else:
+        text = 'single reasoning'
+    return {'candidates': [{'content': {'parts': [{'text': text}]}}]}
+
+
+@pytest.fixture
+def gemini(fake_http_server, monkeypatch):
+    """Fake generateContent API with empty reasoning caches"""
+    api = fake_http_server(generate_content_response)
+    monkeypatch.setattr(server, 'GEMINI_API_KEY', 'test-key')
+    monkeypatch.setattr(server, 'GEMINI_API_URL', f"{api.url}/generateContent")
+    monkeypatch.setattr(server, 'GEMINI_FAILED', 0.0)
+    monkeypatch.setattr(server, 'REASONING_CACHE', OrderedDict())
+    monkeypatch.setattr(server, 'REASONING_FLIGHTS', {})
+    return api
+
+
+def week_of_predictions():
+    """168 hourly predictions with a handful of distinct reasoning signatures"""
+    return [
+        {'timestamp': f"2025-10-{13 + hour // 24:02d}T{hour % 24:02d}:00:00", 'hour': hour % 24,
+         'predicted_load': 1000.0, 'is_festival': 0, 'festival_name': 'None', 'boost': 1.0, 'model': 'lightgbm'}
+        for hour in range(168)
+    ]
+
+
+def test_failed_call_is_not_retried_per_prediction(gemini):
+    gemini.status = 500
+    predictions = week_of_predictions()
+
+    assert server.generate_batch_reasoning(predictions) == [''] * len(predictions)
+    assert len(gemini.requests) == 1
+    # Backing off: the next batch doesn't call Gemini at all
+    assert server.generate_batch_reasoning(predictions) == [''] * len(predictions)
+    assert len(gemini.requests) == 1
+
+
+def test_uncovered_signatures_are_asked_once_each(gemini):
+    predictions = week_of_predictions()
+    signatures = list(dict.fromkeys(server.reasoning_signature(p) for p in predictions))
+
+    reasonings = server.generate_batch_reasoning(predictions)
+
+    # One batch call, then one call per signature the response left out
+    assert len(gemini.requests) == len(signatures)
+    expected = {signature: 'batch reasoning' if n == 0 else 'single reasoning' for n, signature in enumerate(signatures)}
+    assert reasonings == [expected[server.reasoning_signature(p)] for p in predictions]
+    # Cached: asking again costs nothing
+    assert server.generate_batch_reasoning(predictions) == reasonings
+    assert len(gemini.requests) == len(signatures)
@@ -0,0 +1,96 @@
+"""Shared cache tier: value codecs and the Redis backend against an in-process fake server"""
+
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import pytest
+import redis
+from fakeredis import TcpFakeServer
+
+import server
+
+
+def sample_prediction(**overrides):
+    result = {
+        'id': 'lightgbm:abc-def-c2:485052',
+        'timestamp': '2025-10-20T12:00:00',
+        'hour': 12,
+        'predicted_load': 4321.5,
+        'is_festival': 1,
+        'festival_name': 'Diwali',
+        'boost': 4.5,
+        'model': 'lightgbm',
+        'reasoning': '',
+        'reasoning_status': 'none',
+    }
+    result.update(overrides)
+    return result
+
+
+@pytest.fixture
+def redis_server():
+    """Redis-protocol server on a free local port, serving from a background thread"""
+    fake = TcpFakeServer(('127.0.0.1', 0), server_type='redis')
+    thread = threading.Thread(target=fake.serve_forever, daemon=True)
+    thread.start()
+    yield fake
+    fake.shutdown()
+    fake.server_close()
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """Install a Redis backend at a URL as the shared tier, with empty in-process caches"""
+    def install(url):
+        monkeypatch.setattr(server, 'CACHE_REDIS_URL', url)
+        monkeypatch.setattr(server, 'SHARED_CACHE', server.build_redis_cache_backend())
+        monkeypatch.setattr(server, 'PREDICTION_CACHE', OrderedDict())
+        monkeypatch.setattr(server, 'DISK_CACHE_PATH', '')
+    return install
+
+
+def test_prediction_codec_round_trip():
+    result = sample_prediction(reasoning='Diwali evening shopping peak', reasoning_status='ready')
+    assert server.decode_prediction(server.encode_prediction(result)) == result
+
+
+def test_prediction_codec_long_and_non_ascii_strings():
+    result = sample_prediction(festival_name='दीपावली ' * 100, model='m' * 300, reasoning='x' * 70000, reasoning_status='ready')
+    assert server.decode_prediction(server.encode_prediction(result)) == result
+
+
+def test_holiday_year_codec_round_trip():
+    holidays = {'2025-01-26': ['Republic Day'], '2025-10-20': ['Diwali', 'Naraka Chaturdasi']}
+    assert server.decode_holiday_year(server.encode_holiday_year(holidays)) == holidays
+
+
+def test_redis_mget_and_pipeline_round_trip(redis_server, shared_cache):
+    host, port = redis_server.server_address
+    shared_cache(f'redis://{host}:{port}/0')
+    server.shared_cache_set_many({b'k1': b'v1', b'k2': b'v2'}, 60)
+    assert server.shared_cache_get_many([b'k1', b'missing', b'k2']) == [b'v1', None, b'v2']
+
+
+def test_predictions_read_through_shared_tier(redis_server, shared_cache):
+    host, port = redis_server.server_address
+    shared_cache(f'redis://{host}:{port}/0')
+    timestamps = [datetime(2025, 10, 20, 12), datetime(2025, 10, 20, 13)]
+    results = [sample_prediction(), sample_prediction(timestamp='2025-10-20T13:00:00', hour=13)]
+    server.cache_put_many(timestamps, 'lightgbm', results)
+    server.PREDICTION_CACHE.clear()
+    assert server.cache_get_many(timestamps, 'lightgbm') == results
+    # Promoted into the in-process LRU
+    assert len(server.PREDICTION_CACHE) == 2
+    # Finite TTL in the shared tier, even without an in-process one
+    client = redis.Redis(host=host, port=port)
+    assert 0 < client.ttl(server.prediction_shared_key(timestamps[0], 'lightgbm')) <= server.SHARED_CACHE_TTL
+
+
+def test_backend_failure_is_a_miss(shared_cache):
+    shared_cache('redis://127.0.0.1:1/0')  # Nothing listens there
+    timestamp = datetime(2025, 10, 20, 12)
+    server.cache_put_many([timestamp], 'lightgbm', [sample_prediction()])
+    server.PREDICTION_CACHE.clear()
+    assert server.cache_get_many([timestamp], 'lightgbm') == [None]
+    assert server.shared_cache_get_many([b'k1', b'k2']) == [None, None]